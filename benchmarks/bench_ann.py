@@ -0,0 +1,110 @@
+"""
+Approximate Nearest-Neighbour Benchmark
+IVF index recall and latency against brute-force scoring
+
+Recall@k is the share of the exact top-k (by dot product) that the index
+returns. Vectors are a synthetic clustered collection of unit embeddings,
+or the whole-resume embeddings of a candidate pool (--pool).
+
+Usage:
+  python benchmarks/bench_ann.py [--count 500000] [--dim 384] [--k 500] [--spread 1.0]
+  python benchmarks/bench_ann.py --pool pool/ [--k 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vector_index import IVFIndex, default_nprobe, exact_search
+
+
+def make_vectors(count, dim, seed, topics=400, spread=1.0):
+    """Unit vectors scattered around `topics` random directions (like resume roles)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    vectors = np.empty((count, dim), dtype=np.float32)
+    for start in range(0, count, 65536):
+        stop = min(start + 65536, count)
+        block = centers[rng.integers(0, topics, stop - start)]
+        block += spread * rng.standard_normal(block.shape).astype(np.float32) / np.sqrt(dim)
+        vectors[start:stop] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    return vectors
+
+
+def make_queries(vectors, count, seed, noise=0.8):
+    """Job-description-like queries: noisy copies of random collection vectors"""
+    rng = np.random.default_rng(seed + 1)
+    picks = np.asarray(vectors[np.sort(rng.choice(len(vectors), count, replace=False))])
+    queries = picks + noise * rng.standard_normal(picks.shape).astype(np.float32) / np.sqrt(picks.shape[1])
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def timed_search(search, queries):
+    samples = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        samples.append(time.perf_counter() - start)
+    return np.array(samples) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500000)
+    parser.add_argument('--dim', type=int, default=384)
+    parser.add_argument('--k', type=int, default=500, help="candidates retrieved per query")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--lists', type=int, default=None, help="IVF clusters (default: about 4 * sqrt(count))")
+    parser.add_argument('--nprobe', type=int, nargs='+', default=None)
+    parser.add_argument('--spread', type=float, default=1.0,
+                        help="synthetic noise around each topic (higher = less clustered, harder)")
+    parser.add_argument('--pool', help="candidate pool directory to take the vectors from")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if args.pool:
+        from candidate_pool import CandidatePool
+        vectors = CandidatePool(args.pool).resume_vectors()
+        vectors = np.asarray(vectors[np.arange(len(vectors))])
+        source = f"pool {args.pool}"
+    else:
+        vectors = make_vectors(args.count, args.dim, args.seed, spread=args.spread)
+        source = f"synthetic, spread {args.spread}"
+    queries = make_queries(vectors, min(args.queries, len(vectors)), args.seed)
+    k = min(args.k, len(vectors))
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        index = IVFIndex.build(directory, vectors, lists=args.lists)
+        build_seconds = time.perf_counter() - start
+
+        print(f"Vectors: {len(vectors):,} x {vectors.shape[1]} ({source})  k={k}  "
+              f"lists={index.lists}  build {build_seconds:.1f}s")
+
+        exact_ms, exact = timed_search(lambda q: exact_search(vectors, q, k)[0], queries)
+        print(f"{'search':<16}{'p50 ms':>10}{'p90 ms':>10}{'recall@k':>10}{'speedup':>10}")
+        print(f"{'brute force':<16}{np.median(exact_ms):>10.2f}{np.percentile(exact_ms, 90):>10.2f}"
+              f"{1.0:>10.3f}{1.0:>9.1f}x")
+
+        probes = args.nprobe or sorted({1, 2, 4, 8, 16, 32, 64, default_nprobe(index.lists)})
+        for nprobe in [p for p in probes if p <= index.lists]:
+            ann_ms, found = timed_search(lambda q, index=index, nprobe=nprobe: index.search(q, k, nprobe)[0], queries)
+            recall = np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(found, exact)])
+            label = f"ivf nprobe={nprobe}" + ("*" if nprobe == default_nprobe(index.lists) else "")
+            print(f"{label:<16}{np.median(ann_ms):>10.2f}{np.percentile(ann_ms, 90):>10.2f}"
+                  f"{recall:>10.3f}{np.median(exact_ms) / np.median(ann_ms):>9.1f}x")
+        print("* default nprobe")
+        del index
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Startup Benchmark
+Cold-start cost of `import matcher` in a fresh interpreter
+
+  lazy   - import only (models load on the first semantic call)
+  eager  - import plus the model loads the old module did at import time
+  rev    - `import matcher` from an older git revision (--rev)
+
+Usage: python benchmarks/bench_import.py [--runs 5] [--rev <git-rev>]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import io
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY = """
+import time
+t = time.perf_counter()
+import matcher
+print(time.perf_counter() - t)
+"""
+
+EAGER = """
+import time
+t = time.perf_counter()
+import matcher
+from models import get_sentence_model, get_spacy_model
+get_sentence_model()
+try:
+    get_spacy_model()
+except RuntimeError:
+    pass
+print(time.perf_counter() - t)
+"""
+
+
+def time_snippet(snippet, cwd, runs):
+    """Median wall time of a snippet, each run in a new interpreter"""
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', snippet], cwd=cwd,
+            capture_output=True, text=True, check=True
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def checkout_revision(rev, target):
+    """Extract the tree of a git revision into target"""
+    archive = subprocess.run(
+        ['git', 'archive', rev], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure `import matcher` startup time")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--rev', help="also time an older revision, e.g. the pre-registry commit")
+    args = parser.parse_args()
+
+    print(f"import matcher (lazy)        : {time_snippet(LAZY, ROOT, args.runs):7.3f} s")
+    print(f"import matcher + model loads : {time_snippet(EAGER, ROOT, args.runs):7.3f} s")
+
+    if args.rev:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkout_revision(args.rev, tmp)
+            print(f"import matcher @ {args.rev:<11} : {time_snippet(LAZY, tmp, args.runs):7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+OR-Group Detection Benchmark
+Single pass over skill mentions vs the original three-regex scan
+on job descriptions of 1k to 50k characters
+
+The two detectors do not return identical groups (the regexes also pair
+skills with sentence fragments), so group counts are reported side by side.
+
+Usage: python benchmarks/bench_or_groups.py [--sizes 1000 5000 ...] [--jds 5] [--seed 7]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import SKILL_SYNONYMS, STOP_WORDS
+from corpus import make_job_description
+from matcher import get_matcher
+from utils import normalize_text
+
+DEFAULT_SIZES = [1000, 5000, 10000, 25000, 50000]
+
+
+def legacy_clean_skill_phrase(phrase):
+    phrase = phrase.strip('.,;:!?()[]{}')
+    words = phrase.split()
+    while words and (words[0] in STOP_WORDS or words[0] in ['using', 'with', 'by', 'via', 'like']):
+        words.pop(0)
+    while words and (words[-1] in STOP_WORDS or words[-1] in ['and', 'or']):
+        words.pop()
+    return ' '.join(words).strip('.,;:!?()[]{}')
+
+
+def legacy_detect_skill_groups(jd_text):
+    """Original implementation (nested lazy regex groups, set rebuilt per match)"""
+    or_groups = {}
+    group_id = 0
+    text_lower = jd_text.lower()
+
+    patterns = [
+        r'\b([\w\s.+-]+?)\s+or\s+([\w\s.+-]+?)(?=\s*[.,;:\n]|\s+(?:and|with|for|to|in)\s|\s*$)',
+        r'\b([\w\s.+-]+?)\s*/\s*([\w\s.+-]+?)(?=\s*[.,;:\n]|\s+(?:and|with|for|to|in)\s|\s*$)',
+        r'\b(\w+(?:\s+\w+)?)\s+or\s+(\w+(?:\s+\w+)?)\b',
+    ]
+    for pattern in patterns:
+        for match in re.finditer(pattern, text_lower):
+            skill1_raw = match.group(1).strip()
+            skill2_raw = match.group(2).strip()
+            if len(skill1_raw) > 50 or len(skill2_raw) > 50:
+                continue
+            skill1_clean = legacy_clean_skill_phrase(skill1_raw).strip('.,;:')
+            skill2_clean = legacy_clean_skill_phrase(skill2_raw).strip('.,;:')
+            if not skill1_clean or not skill2_clean:
+                continue
+            if skill1_clean in ['one', 'two', 'more', 'less', 'other', 'another']:
+                continue
+            skill1_norm = SKILL_SYNONYMS.get(skill1_clean, skill1_clean)
+            skill2_norm = SKILL_SYNONYMS.get(skill2_clean, skill2_clean)
+            all_skill_values = set(SKILL_SYNONYMS.values())
+            if skill1_norm in all_skill_values or skill2_norm in all_skill_values:
+                group_key = tuple(sorted([skill1_norm, skill2_norm]))
+                if group_key not in [tuple(sorted(v)) for v in or_groups.values()]:
+                    or_groups[f"group_{group_id}"] = [skill1_norm, skill2_norm]
+                    group_id += 1
+
+    return or_groups
+
+
+def make_job_descriptions(count, target_chars, rng):
+    """Normalized JDs of roughly target_chars (long ones are stitched from sections)"""
+    jds = []
+    for _ in range(count):
+        parts = []
+        size = 0
+        while size < target_chars:
+            parts.append(make_job_description(rng, min(1500, target_chars)))
+            size += len(parts[-1]) + 1
+        jds.append(normalize_text('\n'.join(parts)[:target_chars], preserve_structure=True))
+    return jds
+
+
+def time_detector(detect, jds):
+    start = time.perf_counter()
+    results = [detect(jd) for jd in jds]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--jds', type=int, default=5, help="job descriptions per size")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    matcher = get_matcher()
+    matcher._detect_skill_groups("warm up")  # build the automaton outside the timing
+
+    print(f"{'JD chars':>10}{'legacy ms':>12}{'single-pass ms':>16}{'speedup':>10}{'groups (legacy/new)':>22}")
+    for size in args.sizes:
+        jds = make_job_descriptions(args.jds, size, rng)
+        legacy_time, legacy = time_detector(legacy_detect_skill_groups, jds)
+        new_time, new = time_detector(matcher._detect_skill_groups, jds)
+        groups = f"{sum(map(len, legacy)) / len(jds):.0f}/{sum(map(len, new)) / len(jds):.0f}"
+        print(f"{size:>10,}{legacy_time * 1000 / len(jds):>12.2f}{new_time * 1000 / len(jds):>16.2f}"
+              f"{legacy_time / new_time:>9.1f}x{groups:>22}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
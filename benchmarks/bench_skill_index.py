@@ -0,0 +1,111 @@
+"""
+Skill Index Benchmark
+"At least K of N must-haves" through the inverted skill index against a
+scan of the pool's packed skill bitsets
+
+Candidates are synthetic skill sets: each row lists --skills skills drawn
+with Zipf-like popularity from the real vocabulary, and requirements are
+drawn the same way (popular skills are also the ones JDs ask for).
+
+Usage: python benchmarks/bench_skill_index.py [--count 500000] [--skills 30] [--requirements 8] [--k 4 6 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matcher import get_matcher
+from skill_index import SkillIndex, SkillIndexWriter, requirements_met
+
+APPEND_ROWS = 256   # rows per append, as ingest writes them
+
+
+def make_skill_matrix(count, vocabulary_size, skills, seed):
+    """Boolean (count, vocabulary) rows of about `skills` skills each"""
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, vocabulary_size + 1) ** 0.8
+    popularity /= popularity.sum()
+    matrix = np.zeros((count, vocabulary_size), dtype=bool)
+    for start in range(0, count, 65536):
+        stop = min(start + 65536, count)
+        picks = rng.choice(vocabulary_size, (stop - start, skills), p=popularity)
+        matrix[np.arange(start, stop)[:, None], picks] = True
+    return matrix, popularity
+
+
+def make_requirements(popularity, count, graph, rng):
+    """Requirement lists (one skill plus whatever implies it), like must_have_requirements()"""
+    picks = rng.choice(len(popularity), count, replace=False, p=popularity)
+    return [graph.sources(int(skill_id)) for skill_id in picks]
+
+
+def scan(bits, vocabulary_size, requirements, k, chunk_rows=2048):
+    """Rows meeting k requirements by unpacking every bitset (no index)"""
+    found = []
+    for start in range(0, len(bits), chunk_rows):
+        skill_matrix = np.unpackbits(bits[start:start + chunk_rows], axis=1, count=vocabulary_size).astype(bool)
+        found.append(start + np.flatnonzero(requirements_met(requirements, skill_matrix) >= k))
+    return np.concatenate(found)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500000)
+    parser.add_argument('--skills', type=int, default=30, help="skills per candidate")
+    parser.add_argument('--requirements', type=int, default=8, help="must-haves per job description")
+    parser.add_argument('--k', type=int, nargs='+', default=[4, 6, 8], help="must-haves a candidate needs")
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    matcher = get_matcher()
+    size = len(matcher.vocabulary)
+    matrix, popularity = make_skill_matrix(args.count, size, args.skills, args.seed)
+    bits = np.packbits(matrix, axis=1)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = [make_requirements(popularity, args.requirements, matcher.skill_graph, rng) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        writer = SkillIndexWriter(directory, reset=True)
+        start = time.perf_counter()
+        for first in range(0, args.count, APPEND_ROWS):
+            writer.append(first, matrix[first:first + APPEND_ROWS])
+        append_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        writer.compact()
+        compact_seconds = time.perf_counter() - start
+        index = SkillIndex.load(directory)
+
+        print(f"Candidates: {args.count:,} x {args.skills} skills ({size} in vocabulary)  "
+              f"appends {append_seconds:.1f}s  compact {compact_seconds:.1f}s")
+        print(f"Postings: {writer.meta['bytes'] / 2**20:.1f} MB  "
+              f"(int64 rows {matrix.sum() * 8 / 2**20:.1f} MB, bitsets {bits.nbytes / 2**20:.1f} MB)")
+        print(f"{'k of ' + str(args.requirements):<10}{'viable':>10}{'scan ms':>10}{'index ms':>10}{'speedup':>10}")
+        for k in args.k:
+            scan_ms = []
+            index_ms = []
+            viable = []
+            for requirements in queries:
+                start = time.perf_counter()
+                expected = scan(bits, size, requirements, k)
+                scan_ms.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                rows = index.at_least(requirements, k)
+                index_ms.append(time.perf_counter() - start)
+                if not np.array_equal(rows, expected):
+                    raise SystemExit(f"index and scan disagree for k={k}")
+                viable.append(len(rows) / args.count)
+            scan_ms, index_ms = np.median(scan_ms) * 1000, np.median(index_ms) * 1000
+            print(f"{k:<10}{np.median(viable):>10.2%}{scan_ms:>10.1f}{index_ms:>10.1f}{scan_ms / index_ms:>9.1f}x")
+        del index
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
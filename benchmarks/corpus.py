@@ -0,0 +1,97 @@
+"""
+Synthetic Corpus Generator
+Reproducible resumes and job descriptions built from the config.py vocabularies
+Same seed -> same documents, so benchmark runs are comparable
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SKILL_SYNONYMS, STOP_WORDS
+
+SKILL_ALIASES = list(SKILL_SYNONYMS.keys())
+CANONICAL_SKILLS = sorted(set(SKILL_SYNONYMS.values()))
+FILLER_WORDS = sorted(STOP_WORDS) + [
+    'built', 'systems', 'reporting', 'platform', 'customers', 'pipelines',
+    'delivered', 'improved', 'reduced', 'latency', 'quarterly', 'stakeholders',
+]
+COMPANIES = ['acme corp', 'globex', 'initech', 'umbrella', 'stark industries', 'wayne enterprises']
+
+RESUME_SECTIONS = ['Summary', 'Work Experience', 'Education', 'Technical Skills', 'Projects', 'Certifications']
+JD_SECTIONS = ['About the role', 'Responsibilities', 'Requirements', 'Nice to have', 'Benefits']
+
+
+def _sentence(rng, skill_rate=0.2, min_words=6, max_words=18):
+    words = []
+    for _ in range(rng.randint(min_words, max_words)):
+        words.append(rng.choice(SKILL_ALIASES) if rng.random() < skill_rate else rng.choice(FILLER_WORDS))
+    return ' '.join(words)
+
+
+def _experience_line(rng):
+    skill = rng.choice(SKILL_ALIASES)
+    years = rng.randint(1, 12)
+    return rng.choice([
+        f"{years}+ years of experience with {skill}",
+        f"{skill} ({years} years)",
+        f"worked at {rng.choice(COMPANIES)} for {years} years using {skill}",
+        f"used {skill} for {years} years",
+    ])
+
+
+def make_resume(rng, target_chars=3000):
+    """One resume of roughly target_chars characters"""
+    lines = [
+        "Jane Doe",
+        f"jane.doe{rng.randint(1, 9999)}@example.org | +1-555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+    ]
+    size = sum(len(line) for line in lines)
+    while size < target_chars:
+        heading = rng.choice(RESUME_SECTIONS)
+        lines.append("")
+        lines.append(heading)
+        for _ in range(rng.randint(2, 6)):
+            if heading == 'Education':
+                line = f"Bachelor of Science in {rng.choice(['computer science', 'statistics', 'finance'])}"
+            elif rng.random() < 0.3:
+                line = _experience_line(rng)
+            else:
+                line = _sentence(rng)
+            lines.append(f"- {line}.")
+        size = sum(len(line) + 1 for line in lines)
+    return '\n'.join(lines)
+
+
+def make_job_description(rng, target_chars=1500):
+    """One job description with must-have, nice-to-have and OR phrasing"""
+    lines = ["Senior Analyst"]
+    size = len(lines[0])
+    while size < target_chars:
+        heading = rng.choice(JD_SECTIONS)
+        lines.append("")
+        lines.append(heading)
+        for _ in range(rng.randint(2, 5)):
+            roll = rng.random()
+            if roll < 0.25:
+                line = f"Must have {rng.choice(SKILL_ALIASES)} and {rng.choice(SKILL_ALIASES)}"
+            elif roll < 0.4:
+                line = f"Experience with {rng.choice(SKILL_ALIASES)} or {rng.choice(SKILL_ALIASES)}"
+            elif roll < 0.5:
+                line = f"{rng.choice(SKILL_ALIASES)}/{rng.choice(SKILL_ALIASES)} preferred"
+            elif roll < 0.6:
+                line = f"{rng.randint(2, 8)}+ years of {rng.choice(SKILL_ALIASES)} experience required"
+            else:
+                line = _sentence(rng, skill_rate=0.25)
+            lines.append(f"- {line}.")
+        size = sum(len(line) + 1 for line in lines)
+    return '\n'.join(lines)
+
+
+def make_corpus(resume_count, seed=7, resume_chars=3000, jd_count=1, jd_chars=1500):
+    """(job_descriptions, resumes) with sizes varying +/-50% around the targets"""
+    rng = random.Random(seed)
+    jds = [make_job_description(rng, int(jd_chars * rng.uniform(0.5, 1.5))) for _ in range(jd_count)]
+    resumes = [make_resume(rng, int(resume_chars * rng.uniform(0.5, 1.5))) for _ in range(resume_count)]
+    return jds, resumes
@@ -0,0 +1,202 @@
+"""
+ProMatch Benchmark Suite
+Per-stage latency percentiles, throughput and peak RSS on synthetic corpora
+
+Each corpus size runs in its own interpreter so peak RSS is per size.
+
+Usage:
+  python benchmarks/run_benchmarks.py                       # 1, 100, 1k, 10k resumes
+  python benchmarks/run_benchmarks.py --sizes 1 100 --save baseline.json
+  python benchmarks/run_benchmarks.py --compare baseline.json
+  python benchmarks/run_benchmarks.py --stages extract normalize --sizes 1000
+
+The rerank stage times score_batch() of the whole corpus per job description.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = [1, 100, 1000, 10000]
+STAGES = ['normalize', 'extract', 'experience', 'skill_groups', 'semantic', 'rerank']
+
+# Job descriptions per corpus (OR-group detection runs on these)
+JD_COUNT = 20
+
+# Skills per resume passed to calculate_experience_weights
+EXPERIENCE_SKILLS = 10
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(samples, chars):
+    """Latency percentiles (ms) and throughput for one stage"""
+    ordered = sorted(samples)
+    total = sum(samples)
+    return {
+        'items': len(samples),
+        'p50_ms': percentile(ordered, 50) * 1000,
+        'p90_ms': percentile(ordered, 90) * 1000,
+        'p99_ms': percentile(ordered, 99) * 1000,
+        'total_s': total,
+        'items_per_s': len(samples) / total if total else 0.0,
+        'chars_per_s': chars / total if total else 0.0,
+    }
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(func, items):
+    samples = []
+    results = []
+    for item in items:
+        start = time.perf_counter()
+        results.append(func(item))
+        samples.append(time.perf_counter() - start)
+    return samples, results
+
+
+def run_size(size, stages, seed):
+    """Benchmark every requested stage on one corpus size (child process)"""
+    from corpus import make_corpus
+    from utils import normalize_text
+    from matcher import get_matcher, get_job_profile
+
+    jds, resumes = make_corpus(size, seed=seed, jd_count=min(JD_COUNT, size))
+    matcher = get_matcher()
+    matcher.extract_skills_advanced("warm up")
+
+    report = {'resumes': size, 'stages': {}}
+
+    # Normalized text feeds every later stage, as in the app
+    samples, normalized = timed(lambda t: normalize_text(t, preserve_structure=True), resumes)
+    if 'normalize' in stages:
+        report['stages']['normalize'] = summarize(samples, sum(map(len, resumes)))
+    normalized_jds = [normalize_text(jd, preserve_structure=True) for jd in jds]
+
+    samples, skills = timed(lambda t: matcher.extract_skills_advanced(t), normalized)
+    if 'extract' in stages:
+        report['stages']['extract'] = summarize(samples, sum(map(len, normalized)))
+
+    if 'experience' in stages:
+        def experience(pair):
+            text, found = pair
+            return matcher.calculate_experience_weights(text, sorted(found)[:EXPERIENCE_SKILLS])
+        samples, _ = timed(experience, list(zip(normalized, skills)))
+        report['stages']['experience'] = summarize(samples, sum(map(len, normalized)))
+
+    if 'skill_groups' in stages:
+        samples, _ = timed(matcher._detect_skill_groups, normalized_jds)
+        report['stages']['skill_groups'] = summarize(samples, sum(map(len, normalized_jds)))
+
+    if 'semantic' in stages:
+        if importlib.util.find_spec('sentence_transformers') is None:
+            report['skipped'] = ['semantic (sentence-transformers not installed)']
+        else:
+            profile = get_job_profile(normalized_jds[0])
+            profile.embedding  # load the model outside the timing
+            samples, _ = timed(lambda t: matcher.semantic_similarity_scored(
+                profile.job_description, t, jd_embedding=profile.embedding), normalized)
+            report['stages']['semantic'] = summarize(samples, sum(map(len, normalized)))
+
+    if 'rerank' in stages:
+        if importlib.util.find_spec('sentence_transformers') is None:
+            report.setdefault('skipped', []).append('rerank (sentence-transformers not installed)')
+        else:
+            # Whole pool against each JD; the pool is prepared (and embedded) once
+            pool = matcher.prepare_batch(normalized)
+            matcher.score_batch(normalized_jds[0], pool)
+            profiles = [get_job_profile(jd) for jd in normalized_jds]
+            for profile in profiles:
+                profile.embedding
+            samples, _ = timed(lambda p: matcher.score_batch(p, pool), profiles)
+            report['stages']['rerank'] = summarize(samples, sum(map(len, normalized)) * len(profiles))
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    return report
+
+
+def run_in_child(size, stages, seed):
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', str(size),
+           '--seed', str(seed), '--stages', *stages]
+    out = subprocess.run(cmd, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"benchmark for {size} resumes failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def print_report(report, baseline=None):
+    base_sizes = {str(r['resumes']): r for r in (baseline or {}).get('runs', [])}
+
+    for run in report['runs']:
+        print(f"\n=== {run['resumes']:,} resume(s)   peak RSS {run['peak_rss_mb']:.0f} MB")
+        for note in run.get('skipped', []):
+            print(f"    skipped: {note}")
+        print(f"    {'stage':<14}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'items/s':>12}{'vs base':>10}")
+        base_run = base_sizes.get(str(run['resumes']), {}).get('stages', {})
+        for stage, stats in run['stages'].items():
+            delta = ''
+            if stage in base_run and base_run[stage]['p50_ms']:
+                change = (stats['p50_ms'] - base_run[stage]['p50_ms']) / base_run[stage]['p50_ms'] * 100
+                delta = f"{change:+.0f}%"
+            print(f"    {stage:<14}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}"
+                  f"{stats['p99_ms']:>10.2f}{stats['items_per_s']:>12.1f}{delta:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ProMatch benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--save', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', help="baseline JSON to compare p50 latencies against")
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_size(args.child, args.stages, args.seed)))
+        return 0
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'runs': [run_in_child(size, args.stages, args.seed) for size in args.sizes],
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
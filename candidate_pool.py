@@ -0,0 +1,529 @@
+"""
+Persistent Candidate Pool
+A prepared CandidateBatch on disk, for re-ranking without re-reading files
+
+Every column is a flat little-endian file, appended during ingestion and
+memory-mapped for ranking:
+- text.bin / text.end:       normalized resume text (UTF-8) and row end offsets
+- skills.bits:               packed skill bitset per row (vocabulary order)
+- years.i8:                  years of experience per row and skill
+- vectors.f32 / vectors.end: resume + section embeddings and row end offsets
+- vectors.section:           section of each vector (-1: whole resume)
+- records.json / records.end: contact metadata per row
+- meta.json:                 row counts, vocabulary, model and sections
+- postings.*:                skill -> rows inverted index (skill_index.py)
+- lock:                      locked by the one PoolWriter allowed at a time
+meta.json is replaced last on every append, so an interrupted ingest
+leaves a valid pool holding the rows written so far. The skill index is
+appended after it and catches up from skills.bits when it falls behind.
+
+Ranking maps one chunk of rows at a time, so resident memory depends on
+the chunk size and the number of results kept, not on the pool size.
+For very large pools an IVF index (vector_index.py) over the resume
+embeddings can prefilter the candidates that get full skill scoring, and
+the skill index keeps candidates short of the JD's must-haves out of it.
+"""
+import json
+import os
+import tempfile
+from collections import deque
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows: the single writer is not enforced
+    fcntl = None
+
+from experience import experience_years
+from matcher import CandidateBatch, get_matcher, EMBEDDING_BATCH_SIZE
+from models import EMBEDDING_MODEL_NAME, get_embedding_dimension
+from pipeline import parse_document, load_resume, worker_pool, MIN_SCORABLE_CHARS
+from sections import SECTION_HEADERS
+from skill_index import SkillIndex, SkillIndexWriter, must_have_requirements, requirements_met
+from vector_index import IVFIndex, drop_index, exact_search
+
+# Bump when a column's layout or meaning changes
+POOL_FORMAT_VERSION = 1
+
+# Rows scored per step while ranking
+RANK_CHUNK_ROWS = 2048
+
+# Resumes embedded and appended per step while ingesting
+INGEST_CHUNK_ROWS = 256
+
+# Smaller pools are searched exactly even when indexed: brute force takes
+# under ~20 ms there and IVF recall drops on small pools (bench_ann.py)
+EXACT_SEARCH_ROWS = 100000
+
+_SECTION_NAMES = list(SECTION_HEADERS)
+_SECTION_IDS = {name: idx for idx, name in enumerate(_SECTION_NAMES)}
+# Owner label per stored section id; id -1 (whole resume) reads the trailing None
+_SECTION_LABELS = _SECTION_NAMES + [None]
+
+_RECORD_FIELDS = ('file_name', 'emails', 'phones', 'total_exp', 'education', 'completeness', 'certs')
+
+
+class _RowSkills:
+    """Skill name sets of a boolean skill matrix, built only when indexed"""
+
+    def __init__(self, skill_matrix, names):
+        self.skill_matrix = skill_matrix
+        self.names = names
+
+    def __len__(self):
+        return len(self.skill_matrix)
+
+    def __getitem__(self, row):
+        return {self.names[i] for i in np.flatnonzero(self.skill_matrix[row])}
+
+
+class _RowVectors:
+    """Rows of a vector column picked by position, read on indexing"""
+
+    def __init__(self, vectors, positions):
+        self.vectors = vectors
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        return np.asarray(self.vectors[self.positions[index]])
+
+
+def _row_ranges(ends, rows):
+    """(starts, stops) of rows in a column addressed by row end offsets"""
+    stops = ends[rows]
+    starts = np.where(rows > 0, ends[np.maximum(rows - 1, 0)], 0)
+    return starts, stops
+
+
+class CandidatePool:
+    """
+    Read side of a pool directory
+    Raises ValueError when the pool was built with another skill
+    vocabulary, embedding model or format version (re-ingest it)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.meta = _read_meta(directory)
+        if self.meta is None:
+            raise ValueError(f"{directory} is not a candidate pool")
+
+        matcher = get_matcher()
+        expected = _pool_signature(matcher)
+        for field, value in expected.items():
+            if self.meta.get(field) != value:
+                raise ValueError(f"candidate pool {directory} was built with a different {field}; re-ingest it")
+        self.vocabulary = matcher.vocabulary
+        self.dim = self.meta['dim']
+        self.bitset_width = (len(self.vocabulary) + 7) // 8
+
+    def __len__(self):
+        return self.meta['count']
+
+    def _column(self, name, dtype, shape):
+        """Read-only map of one column (unmapped once the caller drops it)"""
+        if not shape[0]:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(os.path.join(self.directory, name), dtype=dtype, mode='r', shape=shape)
+
+    def batch(self, rows):
+        """CandidateBatch (embeddings included) of the given row indices"""
+        rows = np.asarray(rows, dtype=np.int64)
+        count = len(self)
+        names = self.vocabulary.names
+
+        text = memoryview(self._column('text.bin', np.uint8, (self.meta['text_bytes'],)))
+        starts, stops = _row_ranges(self._column('text.end', np.int64, (count,)), rows)
+        resume_texts = [str(text[a:b], 'utf-8') for a, b in zip(starts.tolist(), stops.tolist())]
+
+        # Every extracted skill is in the vocabulary, so the bitset is the skill set
+        bits = self._column('skills.bits', np.uint8, (count, self.bitset_width))[rows]
+        skill_matrix = np.unpackbits(bits, axis=1, count=len(names)).astype(bool)
+        years = np.array(self._column('years.i8', np.int8, (count, len(names)))[rows])
+
+        batch = CandidateBatch(resume_texts, _RowSkills(skill_matrix, names), skill_matrix, years,
+                               skill_counts=skill_matrix.sum(axis=1))
+
+        vector_count = self.meta['vectors']
+        starts, stops = _row_ranges(self._column('vectors.end', np.int64, (count,)), rows)
+        lengths = stops - starts
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        batch.semantic_vectors = np.array(self._column('vectors.f32', np.float32, (vector_count, self.dim))[positions])
+        sections = self._column('vectors.section', np.int8, (vector_count,))[positions].tolist()
+        owners = np.repeat(np.arange(len(rows)), lengths).tolist()
+        batch.semantic_owners = [(owner, _SECTION_LABELS[section]) for owner, section in zip(owners, sections)]
+        return batch
+
+    def records(self, rows):
+        """Contact metadata dicts of the given row indices"""
+        blob = self._column('records.json', np.uint8, (self.meta['records_bytes'],))
+        starts, stops = _row_ranges(self._column('records.end', np.int64, (len(self),)), np.asarray(rows, dtype=np.int64))
+        return [json.loads(blob[a:b].tobytes()) for a, b in zip(starts.tolist(), stops.tolist())]
+
+    def resume_vectors(self, rows=None):
+        """Whole-resume embeddings of rows (default: all), indexable like an array"""
+        count = len(self)
+        ends = self._column('vectors.end', np.int64, (count,))
+        rows = np.arange(count) if rows is None else np.asarray(rows, dtype=np.int64)
+        vectors = self._column('vectors.f32', np.float32, (self.meta['vectors'], self.dim))
+        # The whole resume is the first vector of every row
+        return _RowVectors(vectors, _row_ranges(ends, rows)[0])
+
+    def build_index(self, lists=None):
+        """(Re)build the IVF index over the whole-resume embeddings"""
+        if not len(self):
+            drop_index(self.directory)
+            return None
+        return IVFIndex.build(self.directory, self.resume_vectors(), lists=lists)
+
+    def nearest(self, embedding, k, nprobe=None, rows=None):
+        """
+        Rows of the k candidates whose resume embedding is closest to
+        embedding, best first: approximate through the IVF index when one
+        was built, exact for rows appended after it (or without an index,
+        or below EXACT_SEARCH_ROWS)
+        rows: search only these candidates (exactly)
+        """
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            return exact_search(self.resume_vectors(rows), embedding, k, rows=rows)[0]
+
+        index = IVFIndex.load(self.directory) if len(self) >= EXACT_SEARCH_ROWS else None
+        if index is not None and len(index) > len(self):
+            index = None    # stale: the pool was rebuilt after indexing
+        indexed = len(index) if index is not None else 0
+
+        rows, scores = index.search(embedding, k, nprobe) if index is not None else (
+            np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        )
+        if indexed < len(self):
+            tail = np.arange(indexed, len(self))
+            tail_rows, tail_scores = exact_search(self.resume_vectors(tail), embedding, k, rows=tail)
+            rows = np.concatenate([rows, tail_rows])
+            scores = np.concatenate([scores, tail_scores])
+        best = np.lexsort((rows, -scores))[:k]
+        return rows[best]
+
+    def viable(self, profile, min_must_have, chunk_rows=RANK_CHUNK_ROWS):
+        """
+        Ascending rows of the candidates that meet at least min_must_have
+        of a job's requirements (must-haves, one per OR group) exactly or
+        through an implied skill, from the skill index; rows appended after
+        it are checked on their skill bitsets. min_must_have is capped at
+        the number of requirements, so a JD without must-haves keeps all
+        """
+        matcher = get_matcher()
+        profile = matcher.get_job_profile(profile)
+        requirements = must_have_requirements(profile, matcher.skill_graph)
+        needed = min(min_must_have, len(requirements))
+        if needed <= 0:
+            return np.arange(len(self))
+
+        index = SkillIndex.load(self.directory)
+        if index is not None and len(index) > len(self):
+            index = None    # stale: the pool was rebuilt after indexing
+        indexed = len(index) if index is not None else 0
+        found = [index.at_least(requirements, needed)] if index is not None else []
+
+        bits = self._column('skills.bits', np.uint8, (len(self), self.bitset_width))
+        for start in range(indexed, len(self), chunk_rows):
+            skill_matrix = np.unpackbits(bits[start:start + chunk_rows], axis=1, count=len(self.vocabulary)).astype(bool)
+            found.append(start + np.flatnonzero(requirements_met(requirements, skill_matrix) >= needed))
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def rank(self, profile, top=50, weights=None, chunk_rows=RANK_CHUNK_ROWS, prefilter=None, nprobe=None,
+             min_must_have=None):
+        """
+        Best `top` candidates for a job description, scored chunk by chunk
+        prefilter: score only this many candidates, the semantically
+        closest ones (nearest()); None scores the whole pool
+        min_must_have: score only candidates meeting at least this many
+        must-haves (viable()); applied before prefilter, which then
+        searches the viable candidates exactly
+        Returns records (pool metadata plus 'analysis', best first); the
+        analyses are the same as analyze_batch() over the original texts
+        """
+        matcher = get_matcher()
+        profile = matcher.get_job_profile(profile)
+
+        candidates = None
+        if min_must_have is not None:
+            candidates = self.viable(profile, min_must_have, chunk_rows)
+        if prefilter is not None:
+            candidates = np.sort(self.nearest(profile.embedding, prefilter, nprobe, rows=candidates))
+        if candidates is None:
+            candidates = np.arange(len(self))
+
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0)
+        for start in range(0, len(candidates), chunk_rows):
+            rows = candidates[start:start + chunk_rows]
+            scores = matcher.score_batch(profile, self.batch(rows), weights=weights)['overall_score']
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores])
+            # Highest score first, pool order among ties
+            keep = np.lexsort((best_rows, -best_scores))[:top]
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        if not len(best_rows):
+            return []
+        analyses = matcher.analyze_batch(profile, self.batch(best_rows), weights=weights)
+        records = self.records(best_rows)
+        for record, analysis in zip(records, analyses):
+            record['analysis'] = analysis
+        return records
+
+
+class PoolBusyError(ValueError):
+    """Another process is writing the pool"""
+
+
+class PoolWriter:
+    """
+    Append side of a pool directory (one writer at a time)
+    append=False starts an empty pool; append=True keeps existing rows
+    Holds an exclusive lock on the directory until close(); opening a
+    second writer raises PoolBusyError instead of truncating its files
+    """
+
+    def __init__(self, directory, append=False):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = open(os.path.join(directory, 'lock'), 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock.close()
+                raise PoolBusyError(f"candidate pool {directory} is being written by another process") from None
+        try:
+            self._open(append)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, append):
+        directory = self.directory
+        matcher = get_matcher()
+        self.vocabulary = matcher.vocabulary
+
+        meta = _read_meta(directory) if append else None
+        if meta is not None and any(meta.get(k) != v for k, v in _pool_signature(matcher).items()):
+            raise ValueError(f"candidate pool {directory} was built with different settings; re-ingest it")
+        fresh = meta is None
+        if fresh:
+            meta = {**_pool_signature(matcher), 'count': 0, 'vectors': 0, 'text_bytes': 0, 'records_bytes': 0}
+            drop_index(directory)
+        self.meta = meta
+
+        # Drop anything written after the last complete append
+        count, vectors = meta['count'], meta['vectors']
+        sizes = {
+            'text.bin': meta['text_bytes'],
+            'text.end': count * 8,
+            'skills.bits': count * ((len(self.vocabulary) + 7) // 8),
+            'years.i8': count * len(self.vocabulary),
+            'vectors.f32': vectors * meta['dim'] * 4,
+            'vectors.end': count * 8,
+            'vectors.section': vectors,
+            'records.json': meta['records_bytes'],
+            'records.end': count * 8,
+        }
+        for name, size in sizes.items():
+            with open(os.path.join(directory, name), 'ab') as f:
+                f.truncate(size)
+
+        self.skill_index = SkillIndexWriter(directory, reset=fresh)
+        if len(self.skill_index) > count:
+            self.skill_index = SkillIndexWriter(directory, reset=True)
+        self._catch_up_skill_index()
+        self._write_meta()
+        self._names = None
+
+    def _catch_up_skill_index(self):
+        """Index the rows an interrupted append (or an older pool) left out"""
+        count, width = self.meta['count'], (len(self.vocabulary) + 7) // 8
+        if len(self.skill_index) == count:
+            return
+        bits = np.memmap(os.path.join(self.directory, 'skills.bits'), dtype=np.uint8, mode='r', shape=(count, width))
+        for start in range(len(self.skill_index), count, RANK_CHUNK_ROWS):
+            skill_matrix = np.unpackbits(bits[start:start + RANK_CHUNK_ROWS], axis=1, count=len(self.vocabulary))
+            self.skill_index.append(start, skill_matrix.astype(bool))
+        del bits
+        self.finish()
+
+    def finish(self):
+        """Merge the skill index blocks left by many appends"""
+        if self.skill_index.needs_compaction():
+            self.skill_index.compact()
+
+    def close(self):
+        """Release the pool for other writers"""
+        self._lock.close()
+
+    def names(self):
+        """file_name of every row already in the pool"""
+        if self._names is None:
+            pool = CandidatePool(self.directory)
+            self._names = {record['file_name'] for record in pool.records(np.arange(len(pool)))}
+        return self._names
+
+    def append(self, batch, records):
+        """Add an embedded CandidateBatch and its metadata records"""
+        meta = self.meta
+        first_row = meta['count']
+        texts = [text.encode('utf-8') for text in batch.resume_texts]
+        blobs = [json.dumps({k: record.get(k) for k in _RECORD_FIELDS}).encode('utf-8') for record in records]
+
+        per_row = np.bincount([owner for owner, _ in batch.semantic_owners], minlength=len(batch))
+        sections = [-1 if section is None else _SECTION_IDS[section] for _, section in batch.semantic_owners]
+
+        self._extend('text.bin', b''.join(texts))
+        self._extend('text.end', (meta['text_bytes'] + np.cumsum([len(t) for t in texts])).astype('<i8'))
+        self._extend('skills.bits', np.packbits(batch.skill_matrix, axis=1))
+        self._extend('years.i8', np.ascontiguousarray(batch.years, dtype=np.int8))
+        self._extend('vectors.f32', np.ascontiguousarray(batch.semantic_vectors, dtype='<f4'))
+        self._extend('vectors.end', (meta['vectors'] + np.cumsum(per_row)).astype('<i8'))
+        self._extend('vectors.section', np.array(sections, dtype=np.int8))
+        self._extend('records.json', b''.join(blobs))
+        self._extend('records.end', (meta['records_bytes'] + np.cumsum([len(b) for b in blobs])).astype('<i8'))
+
+        meta['count'] += len(batch)
+        meta['vectors'] += len(sections)
+        meta['text_bytes'] += sum(map(len, texts))
+        meta['records_bytes'] += sum(map(len, blobs))
+        self._write_meta()
+        self.skill_index.append(first_row, batch.skill_matrix)
+        if self._names is not None:
+            self._names.update(record['file_name'] for record in records)
+
+    def _extend(self, name, data):
+        payload = data if isinstance(data, bytes) else data.tobytes()
+        with open(os.path.join(self.directory, name), 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_meta(self):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.directory, 'meta.json'))
+
+
+def _pool_signature(matcher):
+    """Settings a pool must share with the running code to be readable"""
+    return {
+        'version': POOL_FORMAT_VERSION,
+        'model': EMBEDDING_MODEL_NAME,
+        'dim': int(get_embedding_dimension(EMBEDDING_MODEL_NAME)),
+        'vocabulary': list(matcher.vocabulary.names),
+        'sections': _SECTION_NAMES,
+    }
+
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, 'meta.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def extract_candidate(name, data):
+    """
+    Worker: one file -> (name, row, error)
+    row: (resume_text, SectionIndex, skills, {skill: years}, metadata record)
+    """
+    try:
+        document, error = parse_document(name, data)
+        if error:
+            return name, None, error
+        document, sections = load_resume(document)
+        resume_text = document['resume_text']
+        if len(resume_text) < MIN_SCORABLE_CHARS:
+            return name, None, "Resume too short for analysis"
+
+        skills = get_matcher().extract_skills_advanced(resume_text, context="resume")
+        years = experience_years(resume_text, sorted(skills))
+    except Exception as e:
+        return name, None, f"Error processing file: {e}"
+
+    record = {k: document.get(k) for k in _RECORD_FIELDS}
+    record['file_name'] = name
+    return name, (resume_text, sections, skills, years, record), None
+
+
+def ingest(directory, documents, workers=None, append=False, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Parse, extract and embed documents into a pool directory
+    documents: iterable of (name, file_bytes or file_path), consumed lazily;
+    names already stored (with append) or seen earlier in the run are skipped
+    Yields (name, error) per document as it is stored (error None) or rejected
+    Rows keep the input order; only a bounded window of documents is parsed
+    ahead of the embedder, so memory does not grow with the input
+    """
+    writer = PoolWriter(directory, append=append)
+    try:
+        yield from _ingest(writer, documents, workers, append, batch_size)
+    finally:
+        writer.close()
+
+
+def _ingest(writer, documents, workers, append, batch_size):
+    matcher = get_matcher()
+    seen = set(writer.names()) if append else set()
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max(workers * 4, batch_size * 2)
+    documents = iter(documents)
+    in_flight = deque()     # extract_candidate futures, in input order
+    pending = []
+
+    def flush():
+        texts, sections, skills, years, records = zip(*pending)
+        batch = matcher.build_batch(texts, list(skills), years)
+        matcher.embed_batch(batch, batch_size, sections)
+        writer.append(batch, records)
+        names = [record['file_name'] for record in records]
+        pending.clear()
+        return names
+
+    pool = worker_pool(workers)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < max_in_flight:
+                try:
+                    name, data = next(documents)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if name in seen:
+                    continue
+                seen.add(name)
+                in_flight.append(pool.submit(extract_candidate, name, data))
+            if not in_flight:
+                break
+
+            name, row, error = in_flight.popleft().result()
+            if row is None:
+                yield name, error
+                continue
+            pending.append(row)
+            if len(pending) >= INGEST_CHUNK_ROWS:
+                for stored in flush():
+                    yield stored, None
+    finally:
+        # Interrupted: drop the queued documents without waiting for them
+        for future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=not in_flight, cancel_futures=True)
+
+    if pending:
+        for stored in flush():
+            yield stored, None
+    writer.finish()
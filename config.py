@@ -6,6 +6,7 @@ Comprehensive skill database covering ALL industries and fields
 Designed for maximum matching accuracy with zero false positives
 =============================================================================
 """
+import os
 
 # =============================================================================
 # EXPLICIT NON-SKILLS (Blacklist - Prevents False Positives)
@@ -1534,4 +1535,72 @@ STOP_WORDS = {
     # Don't extract these as standalone skills
     "ability", "abilities", "capability", "capabilities",
     "demonstrated", "demonstrate", "proven", "prove",
-}
\ No newline at end of file
+}
+
+# =============================================================================
+# SKILL RELATIONSHIPS (partial credit for missing requirements)
+# =============================================================================
+# Interchangeable tools: having one earns 95% credit for another
+EQUIVALENT_TOOLS = {
+    'tableau': ['power bi', 'qlikview', 'looker'],
+    'power bi': ['tableau', 'qlikview', 'looker'],
+    'qlikview': ['tableau', 'power bi', 'looker'],
+    'react': ['angular', 'vue', 'svelte'],
+    'angular': ['react', 'vue', 'svelte'],
+    'vue': ['react', 'angular', 'svelte'],
+    'mysql': ['postgresql', 'sql server', 'oracle database'],
+    'postgresql': ['mysql', 'sql server', 'oracle database'],
+    'mongodb': ['dynamodb', 'couchdb', 'cassandra'],
+    'docker': ['podman', 'containerd'],
+    'jenkins': ['gitlab ci', 'github actions', 'circle ci'],
+    'terraform': ['cloudformation', 'pulumi'],
+    'aws': ['azure', 'google cloud platform'],
+    'amazon web services': ['microsoft azure', 'google cloud platform'],
+    'microsoft azure': ['amazon web services', 'google cloud platform'],
+}
+
+# Broad skill -> specific skills: a specific skill earns 70% credit for the
+# broad one, the broad skill earns 80% credit for a specific one
+RELATED_SKILLS = {
+    'python': ['django', 'flask', 'fastapi', 'pandas', 'numpy'],
+    'javascript': ['react', 'angular', 'vue', 'node.js', 'typescript'],
+    'web development': ['react', 'angular', 'vue', 'html', 'css', 'node.js'],
+    'database management': ['mysql', 'postgresql', 'mongodb', 'sql'],
+    'cloud computing': ['amazon web services', 'microsoft azure', 'google cloud platform'],
+    'data science': ['machine learning', 'data analytics', 'pandas', 'numpy'],
+    'machine learning': ['tensorflow', 'pytorch', 'scikit-learn'],
+}
+
+# =============================================================================
+# SCORING WEIGHTS
+# =============================================================================
+# Weight of each component in the overall score
+SCORING_WEIGHTS = {
+    'must_have': 0.50,      # must-have skill match (0-100)
+    'semantic': 0.20,       # semantic similarity (0-100)
+    'nice_to_have': 0.10,   # nice-to-have skill match (0-100)
+    'experience': 1.0,      # experience bonus (0-15 points)
+    'coverage': 0.05,       # skill coverage relative to the JD (0-100)
+}
+
+# =============================================================================
+# RUNTIME SETTINGS (override with environment variables)
+# =============================================================================
+CACHE_DIR = os.environ.get(
+    "PROMATCH_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "promatch"),
+)
+
+# Disk budget for cached resume/JD embeddings (0 disables the store)
+EMBEDDING_CACHE_MB = int(os.environ.get("PROMATCH_EMBEDDING_CACHE_MB", "512"))
+
+# Disk budget for parsed resumes (raw/normalized text and metadata keyed by
+# file content; 0 disables the cache)
+PARSED_CACHE_MB = int(os.environ.get("PROMATCH_PARSED_CACHE_MB", "256"))
+
+# PDF extraction budget per file: pages and characters read (text beyond
+# them rarely changes a match), and the wall-clock limit for parsing one
+# file in a pipeline worker (0 disables the limit)
+PDF_MAX_PAGES = int(os.environ.get("PROMATCH_PDF_MAX_PAGES", "30"))
+PDF_MAX_CHARS = int(os.environ.get("PROMATCH_PDF_MAX_CHARS", "200000"))
+PARSE_TIMEOUT_SECONDS = float(os.environ.get("PROMATCH_PARSE_TIMEOUT", "30"))
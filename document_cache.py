@@ -0,0 +1,133 @@
+"""
+Parsed Resume Cache
+Content-addressed store of parsed resumes on disk
+
+Keyed by the SHA-256 of the file bytes, so a file seen before (under any
+name, by the app or the CLI) skips pdfminer / python-docx, normalization
+and metadata extraction.
+- <key[:2]>/<key>.json: raw text, normalized text and metadata
+- file modification time is the last-used time
+Least recently used documents are deleted once the store exceeds its
+size cap. Writes are atomic renames, so worker processes can share it.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+
+from config import CACHE_DIR, PARSED_CACHE_MB
+
+# Bump when parsing, normalization or metadata extraction changes
+PARSED_FORMAT_VERSION = 3
+
+# An eviction pass shrinks the store to this fraction of its cap
+EVICT_TO = 0.9
+
+
+def document_key(data):
+    """SHA-256 (hex) of a file's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParsedResumeCache:
+    """Size-bounded on-disk cache of parsed resumes"""
+
+    def __init__(self, directory, max_mb=256):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._size = None  # bytes on disk, measured on the first put
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def _entries(self):
+        """(path, last used, size) of every stored document"""
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # evicted by another process
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def get(self, key):
+        """Parsed document dict, or None when missing / from an older format"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                document = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if document.pop('version', None) != PARSED_FORMAT_VERSION:
+            return None
+        return document
+
+    def put(self, key, document):
+        """Store a parsed document, evicting least recently used ones when full"""
+        path = self._path(key)
+        payload = json.dumps({**document, 'version': PARSED_FORMAT_VERSION}).encode('utf-8')
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Parsed resume cache write failed: {e}", file=sys.stderr)
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, _, size in self._entries())
+            else:
+                self._size += len(payload)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICT_TO
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+
+# Singleton instance
+_parsed_cache = None
+_parsed_cache_failed = False
+
+
+def get_parsed_cache():
+    """Shared parsed-resume cache, or None when disabled/unavailable"""
+    global _parsed_cache, _parsed_cache_failed
+    if _parsed_cache is None and not _parsed_cache_failed:
+        if PARSED_CACHE_MB <= 0:
+            _parsed_cache_failed = True
+            return None
+        try:
+            _parsed_cache = ParsedResumeCache(os.path.join(CACHE_DIR, 'parsed'), max_mb=PARSED_CACHE_MB)
+        except OSError as e:
+            print(f"Parsed resume cache disabled: {e}", file=sys.stderr)
+            _parsed_cache_failed = True
+    return _parsed_cache
@@ -0,0 +1,190 @@
+"""
+Persistent Embedding Store
+Content-addressed cache of sentence embeddings on disk
+- vectors.f32: memory-mapped float32 matrix (capacity x dim)
+- index.bin:   memory-mapped slot table (SHA-256 key, last-used tick)
+- meta.json:   model name, dimension and capacity
+Least recently used slots are reused once the store is full
+
+Each capacity lives in its own subdirectory, so changing the cache size
+never truncates files another process has mapped. Processes sharing a
+store serialize slot allocation and writes with a lock file, and a
+lookup only trusts a slot whose stored key still matches. Every access
+continues from the newest tick in the index, so the entries another
+process touched since our last look are the ones with a newer tick.
+"""
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows: thread lock only
+    fcntl = None
+
+_INDEX_DTYPE = np.dtype([('key', 'u1', (32,)), ('tick', '<u8')])
+
+
+def embedding_key(text, model_name):
+    """SHA-256 of the model name plus whitespace-normalized text"""
+    normalized = ' '.join(text.split())
+    return hashlib.sha256(f"{model_name}\n{normalized}".encode('utf-8')).digest()
+
+
+class EmbeddingStore:
+    """
+    Size-bounded on-disk embedding cache
+    Safe to share between processes; lookups never touch the model
+    """
+
+    def __init__(self, directory, model_name, dim, max_mb=512):
+        self.model_name = model_name
+        self.dim = int(dim)
+        self.capacity = max(1, int(max_mb * 1024 * 1024) // (self.dim * 4 + _INDEX_DTYPE.itemsize))
+        self.directory = os.path.join(directory, f"{self.dim}x{self.capacity}")
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._vectors_path = os.path.join(self.directory, 'vectors.f32')
+        self._index_path = os.path.join(self.directory, 'index.bin')
+        self._meta_path = os.path.join(self.directory, 'meta.json')
+        self._lock_path = os.path.join(self.directory, 'lock')
+
+        meta = {'model': model_name, 'dim': self.dim, 'capacity': self.capacity}
+        with self._locked():
+            # meta.json is written last, so only a never-finished store is created here
+            existing = self._read_meta()
+            if existing is not None and existing != meta:
+                raise OSError(f"{self.directory} holds a different embedding store")
+            mode = 'r+' if existing == meta else 'w+'
+
+            self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode=mode,
+                                      shape=(self.capacity, self.dim))
+            self._index = np.memmap(self._index_path, dtype=_INDEX_DTYPE, mode=mode,
+                                    shape=(self.capacity,))
+
+            if mode == 'w+':
+                self._vectors.flush()
+                self._index.flush()
+                with open(self._meta_path, 'w') as f:
+                    json.dump(meta, f)
+
+        # In-memory lookup: key -> slot (tick 0 marks an empty slot)
+        used = np.flatnonzero(self._index['tick'])
+        self._slots = {self._index['key'][slot].tobytes(): int(slot) for slot in used}
+        self._tick = int(self._index['tick'].max()) if len(used) else 0
+        self._seen = self._tick
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access for this thread and (where supported) other processes"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Pick up entries other processes wrote or used since the last call (lock held)"""
+        ticks = self._index['tick']
+        newest = int(ticks.max())
+        if newest > self._seen:
+            for slot in np.flatnonzero(ticks > self._seen):
+                self._slots[self._index['key'][slot].tobytes()] = int(slot)
+        self._tick = max(self._tick, newest)
+
+    def _slot(self, key):
+        """Slot holding key, or None (also when another process reused the slot)"""
+        slot = self._slots.get(key)
+        if slot is not None and self._index['key'][slot].tobytes() != key:
+            del self._slots[key]
+            return None
+        return slot
+
+    def key_for(self, text):
+        return embedding_key(text, self.model_name)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def get_many(self, keys):
+        """Return {key: vector} for the keys present in the store"""
+        found = {}
+        with self._locked():
+            self._refresh()
+            for key in keys:
+                slot = self._slot(key)
+                if slot is None:
+                    continue
+                self._tick += 1
+                self._index['tick'][slot] = self._tick
+                found[key] = np.array(self._vectors[slot])
+            self._seen = int(self._index['tick'].max())
+        return found
+
+    def put_many(self, keys, vectors):
+        """Store vectors, evicting least recently used entries when full"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._locked():
+            # Keys another process stored meanwhile are reused, not duplicated
+            self._refresh()
+            # Refresh entries being rewritten so eviction cannot pick them
+            for key in keys:
+                slot = self._slot(key)
+                if slot is not None:
+                    self._tick += 1
+                    self._index['tick'][slot] = self._tick
+
+            new_keys = [k for k in dict.fromkeys(keys) if self._slot(k) is None]
+            free = self._free_slots(len(new_keys))
+
+            for key, vector in zip(keys, vectors):
+                slot = self._slot(key)
+                if slot is None:
+                    if not free:
+                        continue
+                    slot = free.pop()
+                    self._slots[key] = slot
+                    self._index['key'][slot] = np.frombuffer(key, dtype=np.uint8)
+                self._tick += 1
+                self._index['tick'][slot] = self._tick
+                self._vectors[slot] = vector
+
+            self._vectors.flush()
+            self._index.flush()
+            self._seen = int(self._index['tick'].max())
+
+    def _free_slots(self, count):
+        """Slots for `count` new entries (empty first, then LRU evictions)"""
+        if count <= 0:
+            return []
+        count = min(count, self.capacity)
+
+        ticks = self._index['tick']
+        empty = np.flatnonzero(ticks == 0)[:count].tolist()
+        needed = count - len(empty)
+        if needed > 0:
+            used = np.flatnonzero(ticks)
+            victims = used[np.argsort(ticks[used], kind='stable')[:needed]].tolist()
+            for slot in victims:
+                self._slots.pop(self._index['key'][slot].tobytes(), None)
+                ticks[slot] = 0
+            empty.extend(victims)
+
+        # pop() takes from the end, keep the lowest slots first
+        return empty[::-1]
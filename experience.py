@@ -0,0 +1,268 @@
+"""
+Experience Mentions
+Years of experience per skill from mentions collected once per resume
+
+The five per-skill regexes of the original calculate_experience_weight,
+  1. N years [of] [experience] [with] [in] <skill>
+  2. <skill> [for] N years
+  3. <skill> (N years)
+  4. <skill> ... for|over N years        (same line)
+  5. N years ... <skill>                 (same line)
+and the "at|with <employer> for|over N years" fallback are replayed over
+mention lists collected once per text, so every skill is resolved by a
+walk over its own mentions instead of a backtracking scan of the resume.
+Each walk keeps the findall semantics (leftmost, non-overlapping matches),
+so the result is the same as running the regexes.
+"""
+import re
+from bisect import bisect_left, bisect_right
+
+from skill_patterns import AhoCorasick, get_synonym_patterns
+
+# Ceiling applied to any single experience claim
+MAX_EXPERIENCE_YEARS = 15
+
+# Characters of context on each side of an employer mention
+EMPLOYER_CONTEXT = 300
+
+# "N years" / "N+ year" (group 2 is the optional plural s)
+YEARS_MENTION = re.compile(r'(\d+)\s*(?:\+)?\s*year(s?)', re.IGNORECASE)
+# "(N years)"
+PAREN_YEARS_MENTION = re.compile(r'\((\d+)\s*(?:\+)?\s*years?\)', re.IGNORECASE)
+# "for N years" / "over N years"
+SPAN_YEARS_MENTION = re.compile(r'(?:for|over)\s+(\d+)\s*(?:\+)?\s*years?', re.IGNORECASE)
+# Where "at|with <employer>" may start, and the character runs it may span
+EMPLOYER_START = re.compile(r'(?=(at|with)\s)')
+EMPLOYER_RUN = re.compile(r'[\w\s&]+')
+_NEWLINE = re.compile(r'\n')
+
+# Optional words between "N years" and the skill (pattern 1)
+_YEARS_FILLERS = ('of', 'experience', 'with', 'in')
+
+
+class ExperienceMentions:
+    """Year and skill mentions of one (lower-cased) resume text"""
+
+    def __init__(self, text, skills):
+        self.text = text
+        self.newlines = [m.start() for m in _NEWLINE.finditer(text)]
+
+        # (start, end, year_end, value); year_end is where an 's' may follow
+        self.years = [(m.start(), m.end(), m.start(2), int(m.group(1)))
+                      for m in YEARS_MENTION.finditer(text)]
+        self.years_by_start = {y[0]: y for y in self.years}
+        self.paren_by_start = {m.start(): (m.end(), int(m.group(1)))
+                               for m in PAREN_YEARS_MENTION.finditer(text)}
+        self.spans = [(m.start(), m.end(), int(m.group(1)))
+                      for m in SPAN_YEARS_MENTION.finditer(text)]
+        self.span_starts = [s[0] for s in self.spans]
+        self.employers = self._employer_mentions()
+
+        # Every occurrence (overlaps included) of each skill and skill word,
+        # from one automaton pass; skills outside it are searched directly
+        automaton, known = get_mention_patterns()
+        found = {}
+        for start, _, pid in automaton.find_all(text):
+            found.setdefault(pid, []).append(start)
+        self.pattern_ids = {}
+        self.starts = []
+        for skill in skills:
+            for pattern in (skill.lower(), skill, *skill.split()):
+                if pattern not in self.pattern_ids:
+                    self.pattern_ids[pattern] = len(self.starts)
+                    if pattern in known:
+                        self.starts.append(found.get(known[pattern], []))
+                    else:
+                        self.starts.append(_occurrences(text, pattern))
+
+        self._years_before = self._years_before_skills()
+
+    def years_for(self, skill):
+        """Years of experience with one skill (0 if none, capped)"""
+        pattern = skill.lower()
+        pid = self.pattern_ids[pattern]
+        starts = self.starts[pid]
+        length = len(pattern)
+
+        best = self._years_before.get(pid, 0)
+        if starts:
+            best = max(best, self._skill_then_years(starts, length),
+                       self._skill_then_spans(starts, length),
+                       self._years_then_skill(starts, length))
+
+        # Context-based detection
+        if best == 0:
+            for start, value in self.employers:
+                lo = max(0, start - EMPLOYER_CONTEXT)
+                hi = min(len(self.text), start + EMPLOYER_CONTEXT)
+                if any(self._occurs_within(self.pattern_ids[w], len(w), lo, hi)
+                       for w in (skill, *skill.split())):
+                    best = max(best, value)
+
+        return min(best, MAX_EXPERIENCE_YEARS)
+
+    # ---- helpers -------------------------------------------------------
+
+    def _skip_space(self, pos):
+        text = self.text
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        return pos
+
+    def _same_line(self, start, end):
+        """No newline in text[start:end] ('.' cannot cross lines)"""
+        idx = bisect_left(self.newlines, start)
+        return idx == len(self.newlines) or self.newlines[idx] >= end
+
+    def _occurs_within(self, pid, length, lo, hi):
+        starts = self.starts[pid]
+        idx = bisect_left(starts, lo)
+        return idx < len(starts) and starts[idx] + length <= hi
+
+    def _years_before_skills(self):
+        """Pattern 1 for all skills at once: {pattern id: max years}"""
+        text = self.text
+        by_start = {}
+        for pid, starts in enumerate(self.starts):
+            for start in starts:
+                by_start.setdefault(start, []).append(pid)
+
+        best = {}
+        for _, end, year_end, value in self.years:
+            reach = self._space_closure({year_end, end})
+            for word in _YEARS_FILLERS:
+                reach |= self._space_closure({p + len(word) for p in reach if text.startswith(word, p)})
+            for pos in reach:
+                for pid in by_start.get(pos, ()):
+                    if value > best.get(pid, 0):
+                        best[pid] = value
+        return best
+
+    def _space_closure(self, positions):
+        """Every position reachable from positions by consuming whitespace"""
+        reach = set()
+        for pos in positions:
+            reach.add(pos)
+            while pos < len(self.text) and self.text[pos].isspace():
+                pos += 1
+                reach.add(pos)
+        return reach
+
+    def _skill_then_years(self, starts, length):
+        """Patterns 2 and 3: '<skill> [for] N years', '<skill> (N years)'"""
+        text = self.text
+        best = 0
+        resume_2 = resume_3 = 0
+        for start in starts:
+            end = start + length
+            pos = self._skip_space(end)
+
+            if start >= resume_2:
+                digits = pos
+                if text.startswith('for', pos):
+                    digits = self._skip_space(pos + 3)
+                years = self.years_by_start.get(digits)
+                if years is not None:
+                    best = max(best, years[3])
+                    resume_2 = years[1]
+
+            if start >= resume_3:
+                paren = self.paren_by_start.get(pos)
+                if paren is not None:
+                    best = max(best, paren[1])
+                    resume_3 = paren[0]
+        return best
+
+    def _skill_then_spans(self, starts, length):
+        """Pattern 4: '<skill> ... for|over N years' on the same line"""
+        best = 0
+        resume = 0
+        for start in starts:
+            if start < resume:
+                continue
+            end = start + length
+            idx = bisect_left(self.span_starts, end)
+            if idx < len(self.spans) and self._same_line(end, self.spans[idx][0]):
+                best = max(best, self.spans[idx][2])
+                resume = self.spans[idx][1]
+        return best
+
+    def _years_then_skill(self, starts, length):
+        """Pattern 5: 'N years ... <skill>' on the same line"""
+        best = 0
+        resume = 0
+        for start, end, year_end, value in self.years:
+            if start < resume:
+                continue
+            idx = bisect_left(starts, end)
+            if idx < len(starts) and self._same_line(end, starts[idx]):
+                best = max(best, value)
+                resume = starts[idx] + length
+                continue
+            # 'years' backs off to 'year' when the skill starts at the s
+            idx = bisect_left(starts, year_end)
+            if end > year_end and idx < len(starts) and starts[idx] == year_end:
+                best = max(best, value)
+                resume = year_end + length
+        return best
+
+    def _employer_mentions(self):
+        """
+        (start, years) of every 'at|with <employer> for|over N years'
+        [\\w\\s&]+ runs greedily, so the last span mention in the run wins
+        """
+        text = self.text
+        runs = [(m.start(), m.end()) for m in EMPLOYER_RUN.finditer(text)]
+        run_starts = [r[0] for r in runs]
+
+        mentions = []
+        resume = 0
+        for m in EMPLOYER_START.finditer(text):
+            start = m.start()
+            if start < resume:
+                continue
+            after = m.end(1)
+            run_end = runs[bisect_right(run_starts, after) - 1][1]
+            # At least one space and one employer character before the span
+            idx = bisect_left(self.span_starts, run_end) - 1
+            if idx >= 0 and self.span_starts[idx] >= after + 2:
+                _, end, value = self.spans[idx]
+                mentions.append((start, value))
+                resume = end
+        return mentions
+
+
+def _occurrences(text, pattern):
+    """Sorted start offsets of pattern in text, overlapping ones included"""
+    starts = []
+    pos = text.find(pattern)
+    while pos != -1:
+        starts.append(pos)
+        pos = text.find(pattern, pos + 1)
+    return starts
+
+
+_mention_patterns = None
+
+def get_mention_patterns():
+    """
+    Shared (automaton, {pattern: id}) of every alias and canonical skill
+    and each of their words, matched anywhere like the experience regexes
+    (no word boundaries)
+    """
+    global _mention_patterns
+    if _mention_patterns is None:
+        patterns = set()
+        for pattern in get_synonym_patterns().patterns:
+            patterns.add(pattern)
+            patterns.update(pattern.split())
+        patterns = sorted(patterns)
+        _mention_patterns = (AhoCorasick(patterns, word_boundaries=False),
+                             {pattern: pid for pid, pattern in enumerate(patterns)})
+    return _mention_patterns
+
+
+def experience_years(resume_text, skills):
+    """{skill: years} for every skill, in input order"""
+    mentions = ExperienceMentions(resume_text.lower(), skills)
+    return {skill: mentions.years_for(skill) for skill in skills}
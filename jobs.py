@@ -0,0 +1,131 @@
+"""
+Background Analysis Jobs
+Batch analysis that keeps running across Streamlit reruns
+
+A job drives a ResumePipeline from a daemon thread; every job submits
+its CPU work to one shared worker pool, so concurrent sessions share the
+cores instead of each starting a process per core. The UI keeps only the
+job id in session state, polls progress and reads the records finished
+so far, so widget interaction never restarts or blocks the batch.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+
+from pipeline import ResumePipeline, worker_pool
+
+# Finished jobs kept for sessions that have not collected them yet
+MAX_FINISHED_JOBS = 16
+
+
+class AnalysisJob:
+    """One batch of documents scored against one job profile"""
+
+    def __init__(self, profile, documents, batch_size, collect_timings=False):
+        self.id = uuid.uuid4().hex
+        self.total = len(documents)
+        self.status = 'running'    # running | done | failed | cancelled
+        self.error = None
+        self.timings = None        # timings block (with wall time) when collect_timings
+        self.started = time.perf_counter()
+        self.finished_at = None
+        self._records = []         # (index, record) in completion order
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._pipeline = ResumePipeline(profile, batch_size=batch_size, collect_timings=collect_timings,
+                                        pool=get_worker_pool())
+        self._thread = threading.Thread(target=self._run, args=(documents,),
+                                        name=f"analysis-{self.id[:8]}", daemon=True)
+        self._thread.start()
+
+    def _run(self, documents):
+        status = 'done'
+        try:
+            for item in self._pipeline.run(documents, cancel=self._cancel):
+                with self._lock:
+                    self._records.append(item)
+            if self._cancel.is_set():
+                status = 'cancelled'
+        except BrokenProcessPool as e:
+            discard_worker_pool(self._pipeline.pool)
+            self.error = f"Error analyzing batch: {e}"
+            status = 'failed'
+        except Exception as e:
+            self.error = f"Error analyzing batch: {e}"
+            status = 'failed'
+        finally:
+            self.finished_at = time.perf_counter()
+            if self._pipeline.timings is not None:
+                self.timings = {
+                    'wall_seconds': self.finished_at - self.started,
+                    'documents': self.total,
+                    **self._pipeline.timings.as_dict()
+                }
+            # Set last: pollers read timings once the job is finished
+            self.status = status
+
+    @property
+    def finished(self):
+        return self.status != 'running'
+
+    def progress(self):
+        """(documents finished, documents total)"""
+        with self._lock:
+            return len(self._records), self.total
+
+    def records(self, start=0):
+        """(index, record) pairs finished so far, from position `start`"""
+        with self._lock:
+            return self._records[start:]
+
+    def cancel(self):
+        """
+        Stop within ResumePipeline's poll interval: queued documents are
+        dropped, ones already in a worker are abandoned (scored results are kept)
+        """
+        self._cancel.set()
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Process pool shared by every job (started on first use)"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = worker_pool()
+        return _worker_pool
+
+
+def discard_worker_pool(pool):
+    """Replace a broken shared pool (a worker died); the next job starts a new one"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is pool:
+            _worker_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def start_job(profile, documents, batch_size, collect_timings=False):
+    """Start scoring documents in the background; returns the AnalysisJob"""
+    job = AnalysisJob(profile, documents, batch_size, collect_timings)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        finished = sorted((j for j in _jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for old in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del _jobs[old.id]
+    return job
+
+
+def get_job(job_id):
+    """AnalysisJob by id, or None (unknown or pruned)"""
+    if job_id is None:
+        return None
+    with _jobs_lock:
+        return _jobs.get(job_id)
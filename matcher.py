@@ -6,23 +6,110 @@ Critical Fixes:
 3. Data visualization tools (Tableau/Power BI) now satisfy "data visualization" requirement
 4. Better skill normalization and grouping
 """
-import spacy
-from sentence_transformers import SentenceTransformer, util
-from config import STOP_WORDS, SKILL_SYNONYMS, EXPLICIT_NON_SKILLS
+from config import (
+    STOP_WORDS, EXPLICIT_NON_SKILLS, EQUIVALENT_TOOLS, RELATED_SKILLS,
+    CACHE_DIR, EMBEDDING_CACHE_MB
+)
 import re
-from collections import Counter
+import hashlib
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+import os
+import sys
 import numpy as np
+from skill_patterns import get_synonym_patterns, leftmost_longest
+from embedding_store import EmbeddingStore
+from models import EMBEDDING_MODEL_NAME, get_sentence_model, get_embedding_dimension
+from profiling import StageTimings, stage
+from scoring import combine_scores, overall_score
+from experience import experience_years
+from sections import segment_sections
+from skill_graph import SkillGraph
+from vocabulary import SkillVocabulary, canonical_skills
 
-# Load NLP Models
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    print("Downloading spacy model...")
-    import os
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# Compound terms the synonym table cannot express
+SPECIAL_SKILL_PATTERNS = [
+    (re.compile(r'\bc\+\+\b'), 'c++'),
+    (re.compile(r'\bc#\b'), 'c#'),
+    (re.compile(r'\bnode\.?js\b'), 'node.js'),
+    (re.compile(r'\breact\.?js\b'), 'react'),
+]
+
+# Text allowed between two skill mentions of one OR group
+OR_SEPARATOR = re.compile(r'\s*(?:,\s*)?(?:or|/|and\s*/\s*or)\s*')
+
+# JD sentence boundaries (priority keywords apply per sentence)
+SENTENCE_BREAKS = re.compile(r'[.!\n]+')
+SENTENCE_BREAK = re.compile(r'[.!\n]')
+
+# Number of compiled job descriptions kept per matcher
+JOB_PROFILE_CACHE_SIZE = 32
+
+# Texts per model.encode forward pass
+EMBEDDING_BATCH_SIZE = 32
+
+
+def job_profile_key(job_description):
+    """Cache key for a (normalized) job description"""
+    return hashlib.sha256(job_description.strip().encode('utf-8')).hexdigest()
+
+
+class JobProfile:
+    """
+    Compiled job description
+    Everything analyze_resume needs from the JD, computed once per batch
+    """
+    
+    def __init__(self, job_description, must_have, nice_to_have, or_groups, all_skills, vocabulary):
+        self.key = job_profile_key(job_description)
+        self.job_description = job_description
+        self.must_have = must_have
+        self.nice_to_have = nice_to_have
+        self.or_groups = or_groups
+        self.all_skills = all_skills
+        self._embedding = None
+        
+        # Requirement columns as vocabulary IDs (-1: never present in a CV)
+        self.must_have_order = list(must_have)
+        self.nice_to_have_order = list(nice_to_have)
+        self.must_have_ids = vocabulary.id_array(self.must_have_order)
+        self.nice_to_have_ids = vocabulary.id_array(self.nice_to_have_order)
+        self.or_member_ids = vocabulary.id_array([s for group in or_groups.values() for s in group])
+        self.or_group_starts = np.cumsum([0] + [len(g) for g in or_groups.values()][:-1]).astype(np.int64)
+        # Columns whose presence puts a skill in must_have_matched
+        self.claimable_ids = np.unique(np.concatenate([
+            self.must_have_ids[self.must_have_ids >= 0], self.or_member_ids[self.or_member_ids >= 0]
+        ]))
+    
+    @property
+    def embedding(self):
+        """JD embedding, encoded on first semantic use"""
+        if self._embedding is None:
+            self._embedding = get_matcher().encode_texts([self.job_description])[0]
+        return self._embedding
+
+
+class CandidateBatch:
+    """
+    Job-independent view of many resumes
+    Extracted skills, years of experience per skill and embeddings are
+    computed once; scoring against any job description is matrix work
+    """
+    
+    def __init__(self, resume_texts, raw_skills, skill_matrix, years, skill_counts=None):
+        self.resume_texts = resume_texts
+        self.raw_skills = raw_skills        # extracted skill set per resume
+        self.skill_matrix = skill_matrix    # (resumes, vocabulary) bool
+        self.years = years                  # (resumes, vocabulary) years per extracted skill
+        if skill_counts is None:
+            skill_counts = [len(skills) for skills in raw_skills]
+        self.skill_counts = np.asarray(skill_counts, dtype=np.int64)
+        self.semantic_vectors = None        # filled on first semantic scoring
+        self.semantic_owners = None
+    
+    def __len__(self):
+        return len(self.resume_texts)
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 class EnterpriseATSMatcher:
     """
@@ -31,6 +118,7 @@ class EnterpriseATSMatcher:
     
     def __init__(self):
         self.skill_categories = self._categorize_skills()
+        self._job_profiles = OrderedDict()
         # COMPREHENSIVE: Define which tools/skills imply other capabilities
         # Format: 'specific_tool': ['broader_capability1', 'broader_capability2']
         self.skill_implies = {
@@ -254,6 +342,15 @@ class EnterpriseATSMatcher:
             'bitbucket': ['version control', 'git', 'collaboration'],
         }
         
+        # Dense IDs for every canonical skill (and every skill the graph mentions)
+        self.vocabulary = SkillVocabulary(
+            canonical_skills(), [skill for _, skill in SPECIAL_SKILL_PATTERNS],
+            self.skill_implies, EQUIVALENT_TOOLS, RELATED_SKILLS
+        )
+        
+        # Implications, equivalent tools and related skills as one compiled graph
+        self.skill_graph = SkillGraph(self.vocabulary, self.skill_implies)
+        
     def _categorize_skills(self):
         """Group skills by category for weighted scoring"""
         categories = {
@@ -273,46 +370,71 @@ class EnterpriseATSMatcher:
     def extract_skills_advanced(self, text, context="resume"):
         """
         FIXED: Advanced skill extraction with strict filtering
+        Single pass over the text through the compiled synonym automaton
         """
         text_lower = text.lower()
-        skills = set()
+        occurrences = get_synonym_patterns().occurrences(text_lower)
+        return self._clean_skills(self._skill_spans(text_lower, occurrences))
+    
+    def extract_sentence_skills(self, text, occurrences=None):
+        """
+        Skills of a whole text and of each of its sentences in one pass
+        Sentences are split on [.!\n] as in re.split; occurrences that
+        cross a sentence break only count for the whole text
+        occurrences: automaton occurrences of text.lower(), if already scanned
+        Returns (all_skills, [skills of sentence i, ...])
+        """
+        text_lower = text.lower()
+        if occurrences is None:
+            occurrences = get_synonym_patterns().occurrences(text_lower)
+        all_skills = self._clean_skills(self._skill_spans(text_lower, occurrences))
+        
+        def within_sentence(start, end):
+            return SENTENCE_BREAK.search(text_lower, start, end) is None
         
-        # Get all valid skill values
-        all_skill_values = set(SKILL_SYNONYMS.values())
+        breaks = [m.end() for m in SENTENCE_BREAKS.finditer(text_lower)]
+        by_sentence = [[] for _ in range(len(breaks) + 1)]
+        within = [o for o in occurrences if within_sentence(o[0], o[1])]
+        for span in self._skill_spans(text_lower, within, keep=within_sentence):
+            by_sentence[bisect_right(breaks, span[0])].append(span)
+        
+        return all_skills, [self._clean_skills(spans) for spans in by_sentence]
+    
+    def _skill_spans(self, text_lower, occurrences, keep=None):
+        """
+        (start, end, skill) found by each extraction method, in the order
+        the methods add them; keep(start, end) filters special-term matches
+        """
+        patterns = get_synonym_patterns()
+        spans = []
         
         # Method 1: Direct matching with word boundaries
-        for skill in all_skill_values:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                if skill not in STOP_WORDS and skill not in EXPLICIT_NON_SKILLS:
-                    skills.add(skill)
-        
-        # Method 2: Match abbreviations/aliases
-        sorted_skills = sorted(SKILL_SYNONYMS.items(), key=lambda x: len(x[0]), reverse=True)
-        matched_positions = set()
-        
-        for abbr, full_skill in sorted_skills:
-            pattern = r'\b' + re.escape(abbr) + r'\b'
-            matches = re.finditer(pattern, text_lower)
-            
-            for match in matches:
-                start, end = match.span()
-                if not any(start < pos[1] and end > pos[0] for pos in matched_positions):
-                    if full_skill not in STOP_WORDS and full_skill not in EXPLICIT_NON_SKILLS:
-                        skills.add(full_skill)
-                        matched_positions.add((start, end))
+        for start, end, pid in occurrences:
+            skill = patterns.value_of.get(pid)
+            if skill is not None and skill not in STOP_WORDS and skill not in EXPLICIT_NON_SKILLS:
+                spans.append((start, end, skill))
+        
+        # Method 2: Match abbreviations/aliases (longest match wins overlaps)
+        def is_skill(pid):
+            full_skill = patterns.canonical[pid]
+            return full_skill not in STOP_WORDS and full_skill not in EXPLICIT_NON_SKILLS
+        
+        for start, end, pid in patterns.select_longest(occurrences, claims=is_skill):
+            spans.append((start, end, patterns.canonical[pid]))
         
         # Method 3: Special compound terms
-        special_patterns = [
-            (r'\bc\+\+\b', 'c++'),
-            (r'\bc#\b', 'c#'),
-            (r'\bnode\.?js\b', 'node.js'),
-            (r'\breact\.?js\b', 'react'),
-        ]
+        for pattern, skill in SPECIAL_SKILL_PATTERNS:
+            for match in pattern.finditer(text_lower):
+                if keep is None or keep(match.start(), match.end()):
+                    spans.append((match.start(), match.end(), skill))
         
-        for pattern, skill in special_patterns:
-            if re.search(pattern, text_lower):
-                skills.add(skill)
+        return spans
+    
+    def _clean_skills(self, spans):
+        """Skill set of extracted spans after the final cleanup"""
+        skills = set()
+        for _, _, skill in spans:
+            skills.add(skill)
         
         # FINAL CLEANUP
         skills_clean = set()
@@ -331,200 +453,170 @@ class EnterpriseATSMatcher:
     
     def calculate_experience_weight(self, resume_text, skill):
         """Calculate years of experience with a skill"""
-        skill_pattern = re.escape(skill)
-        text_lower = resume_text.lower()
-        
-        patterns = [
-            rf'(\d+)\s*(?:\+)?\s*years?\s*(?:of\s*)?(?:experience\s*)?(?:with\s*)?(?:in\s*)?{skill_pattern}',
-            rf'{skill_pattern}\s*(?:for\s*)?(\d+)\s*(?:\+)?\s*years?',
-            rf'{skill_pattern}\s*\((\d+)\s*(?:\+)?\s*years?\)',
-            rf'{skill_pattern}.*?(?:for|over)\s+(\d+)\s*(?:\+)?\s*years?',
-            rf'(\d+)\s*(?:\+)?\s*years?.*?{skill_pattern}',
-        ]
-        
-        max_years = 0
-        for pattern in patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    try:
-                        year_val = int(match) if isinstance(match, str) else int(match[0] if isinstance(match, tuple) else match)
-                        max_years = max(max_years, year_val)
-                    except (ValueError, IndexError):
-                        continue
-        
-        # Context-based detection
-        if max_years == 0:
-            job_pattern = rf'(?:at|with)\s+[\w\s&]+(?:for|over)\s+(\d+)\s*(?:\+)?\s*years?'
-            job_matches = re.finditer(job_pattern, text_lower)
-            
-            for match in job_matches:
-                try:
-                    year_val = int(match.group(1))
-                    pos = match.start()
-                    context_start = max(0, pos - 300)
-                    context_end = min(len(text_lower), pos + 300)
-                    context = text_lower[context_start:context_end]
-                    
-                    if skill in context or any(word in context for word in skill.split()):
-                        max_years = max(max_years, year_val)
-                except (ValueError, AttributeError):
-                    continue
-        
-        return min(max_years, 15)
-    
-    def semantic_similarity_scored(self, jd_text, resume_text):
+        return experience_years(resume_text, [skill])[skill]
+    
+    def calculate_experience_weights(self, resume_text, skills):
+        """
+        Years of experience for many skills at once
+        Year and skill mentions are collected in one pass and joined by
+        proximity, instead of five regex scans of the resume per skill
+        """
+        return experience_years(resume_text, skills)
+    
+    def encode_texts(self, texts, batch_size=EMBEDDING_BATCH_SIZE):
+        """
+        Unit-normalized float32 embeddings
+        Cached vectors come from the on-disk store; the rest are encoded
+        in a single model.encode call and written back
+        """
+        texts = list(texts)
+        dim = get_embedding_dimension(EMBEDDING_MODEL_NAME)
+        embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+        if not texts:
+            return embeddings
+        
+        store = get_embedding_store()
+        with stage('embedding_cache'):
+            keys = [store.key_for(t) for t in texts] if store is not None else None
+            cached = store.get_many(keys) if store is not None else {}
+        
+        missing = []
+        for idx in range(len(texts)):
+            if keys is not None and keys[idx] in cached:
+                embeddings[idx] = cached[keys[idx]]
+            else:
+                missing.append(idx)
+        
+        if missing:
+            batch = [texts[idx] for idx in missing]
+            with stage('encode', sum(map(len, batch))):
+                encoded = get_sentence_model(EMBEDDING_MODEL_NAME).encode(
+                    batch, batch_size=batch_size,
+                    convert_to_numpy=True, normalize_embeddings=True
+                )
+            encoded = np.asarray(encoded, dtype=np.float32)
+            embeddings[missing] = encoded
+            if store is not None:
+                store.put_many([keys[idx] for idx in missing], encoded)
+        
+        return embeddings
+    
+    def semantic_similarity_scored(self, jd_text, resume_text, jd_embedding=None):
         """Multi-level semantic matching"""
-        jd_embedding = model.encode(jd_text, convert_to_tensor=True)
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        overall_similarity = util.pytorch_cos_sim(jd_embedding, resume_embedding).item()
-        
-        sections = self._extract_sections(resume_text)
-        section_scores = {}
-        
-        if sections:
-            for section_name, section_text in sections.items():
-                if len(section_text) > 20:
-                    section_embedding = model.encode(section_text, convert_to_tensor=True)
-                    section_sim = util.pytorch_cos_sim(jd_embedding, section_embedding).item()
-                    section_scores[section_name] = section_sim * 100
+        if jd_embedding is None:
+            jd_embedding = self.encode_texts([jd_text])[0]
+        return self._semantic_scores(jd_embedding, [resume_text])[0]
+    
+    def semantic_similarity_batch(self, profile, resume_texts, batch_size=EMBEDDING_BATCH_SIZE, sections=None):
+        """
+        Multi-level semantic matching for many resumes at once
+        Every resume and section text goes through one encode call and is
+        scored against the cached JD vector with one matrix multiply
+        sections: SectionIndex per resume, when already segmented
+        """
+        profile = self.get_job_profile(profile)
+        return self._semantic_scores(profile.embedding, resume_texts, batch_size, sections)
+    
+    def _semantic_scores(self, jd_embedding, resume_texts, batch_size=EMBEDDING_BATCH_SIZE, sections=None):
+        """Cosine similarities of resumes and their sections to one JD vector"""
+        vectors, owners = self._semantic_vectors(resume_texts, batch_size, sections)
+        return self._score_semantic_vectors(jd_embedding, vectors, owners, len(resume_texts))
+    
+    def _semantic_vectors(self, resume_texts, batch_size=EMBEDDING_BATCH_SIZE, sections=None):
+        """
+        Embeddings of every resume and section text (one encode call)
+        owners: (resume index, section name or None for the whole resume)
+        """
+        texts = []
+        owners = []
+        
+        for idx, resume_text in enumerate(resume_texts):
+            texts.append(resume_text)
+            owners.append((idx, None))
+            index = sections[idx] if sections is not None else segment_sections(resume_text)
+            for section_name, length in index.lengths().items():
+                if length > 20:
+                    texts.append(index.text(resume_text, section_name))
+                    owners.append((idx, section_name))
+        
+        return self.encode_texts(texts, batch_size), owners
+    
+    def _score_semantic_vectors(self, jd_embedding, vectors, owners, count):
+        """Per-resume semantic results from _semantic_vectors() output"""
+        # Row-wise dot products: a row's score never depends on the batch it is in
+        similarities = (vectors * np.asarray(jd_embedding, dtype=np.float32)).sum(axis=1)
+        
+        results = [{'overall': 0.0, 'sections': {}} for _ in range(count)]
+        for (idx, section_name), similarity in zip(owners, similarities.tolist()):
+            if section_name is None:
+                results[idx]['overall'] = similarity * 100
+            else:
+                results[idx]['sections'][section_name] = similarity * 100
         
-        return {
-            'overall': overall_similarity * 100,
-            'sections': section_scores
-        }
+        return results
     
     def _extract_sections(self, resume_text):
         """Extract resume sections"""
-        sections = {}
-        section_patterns = {
-            'experience': r'(?:work\s+)?experience|employment\s+history|professional\s+experience',
-            'education': r'education|academic\s+background|qualifications',
-            'skills': r'(?:technical\s+)?skills|competencies|expertise',
-            'projects': r'projects|portfolio',
-        }
-        
-        lines = resume_text.split('\n')
-        current_section = None
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            section_found = False
-            
-            for section_name, pattern in section_patterns.items():
-                if re.search(pattern, line_lower) and len(line_lower) < 50:
-                    current_section = section_name
-                    sections[section_name] = ""
-                    section_found = True
-                    break
-            
-            if not section_found and current_section:
-                sections[current_section] += line + "\n"
-        
-        return sections
+        index = segment_sections(resume_text)
+        return {name: index.text(resume_text, name) for name in index.spans}
     
-    def _detect_skill_groups(self, jd_text):
+    def _detect_skill_groups(self, jd_text, occurrences=None):
         """
-        IMPROVED: Detect OR groups like "Tableau or Power BI"
-        Now with better pattern matching for all variations
+        Detect OR groups like "Tableau or Power BI" and "Tableau/Power BI"
+        Single pass over the skill mentions of the JD: consecutive mentions
+        joined only by "or", "/" or "and/or" form one group
+        occurrences: automaton occurrences of jd_text.lower(), if already scanned
         """
-        or_groups = {}
-        group_id = 0
-        
         text_lower = jd_text.lower()
+        if occurrences is None:
+            occurrences = get_synonym_patterns().occurrences(text_lower)
         
-        # Multiple patterns to catch different variations
-        or_patterns = [
-            # Pattern 1: "skill1 or skill2" with word boundaries
-            r'\b([\w\s.+-]+?)\s+or\s+([\w\s.+-]+?)(?=\s*[.,;:\n]|\s+(?:and|with|for|to|in)\s|\s*$)',
-            
-            # Pattern 2: "skill1/skill2"
-            r'\b([\w\s.+-]+?)\s*/\s*([\w\s.+-]+?)(?=\s*[.,;:\n]|\s+(?:and|with|for|to|in)\s|\s*$)',
-            
-            # Pattern 3: Simple "word or word" 
-            r'\b(\w+(?:\s+\w+)?)\s+or\s+(\w+(?:\s+\w+)?)\b',
-        ]
-        
-        for pattern in or_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                try:
-                    skill1_raw = match.group(1).strip()
-                    skill2_raw = match.group(2).strip()
-                    
-                    # Skip if too long (likely sentence fragments)
-                    if len(skill1_raw) > 50 or len(skill2_raw) > 50:
-                        continue
-                    
-                    # Clean up: remove leading/trailing stop words and punctuation
-                    skill1_clean = self._clean_skill_phrase(skill1_raw).strip('.,;:')
-                    skill2_clean = self._clean_skill_phrase(skill2_raw).strip('.,;:')
-                    
-                    # Skip if empty after cleaning
-                    if not skill1_clean or not skill2_clean:
-                        continue
-                    
-                    # Skip common false positives
-                    if skill1_clean in ['one', 'two', 'more', 'less', 'other', 'another']:
-                        continue
-                    
-                    # Normalize to our skill database
-                    skill1_norm = SKILL_SYNONYMS.get(skill1_clean, skill1_clean)
-                    skill2_norm = SKILL_SYNONYMS.get(skill2_clean, skill2_clean)
-                    
-                    # Check if these are real skills
-                    all_skills = set(SKILL_SYNONYMS.values())
-                    
-                    # Create group if at least one is a valid skill
-                    if skill1_norm in all_skills or skill2_norm in all_skills:
-                        # Avoid duplicates
-                        group_key = tuple(sorted([skill1_norm, skill2_norm]))
-                        if group_key not in [tuple(sorted(v)) for v in or_groups.values()]:
-                            or_groups[f"group_{group_id}"] = [skill1_norm, skill2_norm]
-                            group_id += 1
-                except (IndexError, AttributeError):
-                    continue
+        or_groups = {}
+        seen = set()
+        run = []
+        previous_end = 0
+        for start, end, skill in self._skill_mentions(text_lower, occurrences):
+            if run and OR_SEPARATOR.fullmatch(text_lower, previous_end, start):
+                run.append(skill)
+            else:
+                self._add_or_group(or_groups, seen, run)
+                run = [skill]
+            previous_end = end
+        self._add_or_group(or_groups, seen, run)
         
         return or_groups
     
-    def _clean_skill_phrase(self, phrase):
-        """Remove stop words and punctuation from beginning/end of skill phrase"""
-        if not phrase:
-            return ""
-        
-        # Remove common punctuation first
-        phrase = phrase.strip('.,;:!?()[]{}')
-        
-        words = phrase.split()
-        
-        # Remove leading stop words
-        while words and (words[0] in STOP_WORDS or words[0] in ['using', 'with', 'by', 'via', 'like']):
-            words.pop(0)
-        
-        # Remove trailing stop words
-        while words and (words[-1] in STOP_WORDS or words[-1] in ['and', 'or']):
-            words.pop()
-        
-        cleaned = ' '.join(words)
-        
-        # Remove any remaining punctuation
-        cleaned = cleaned.strip('.,;:!?()[]{}')
-        
-        return cleaned
+    def _skill_mentions(self, text_lower, occurrences):
+        """(start, end, canonical skill) of every skill mention, in text order"""
+        patterns = get_synonym_patterns()
+        spans = [(start, end, patterns.canonical[pid]) for start, end, pid in occurrences]
+        for pattern, skill in SPECIAL_SKILL_PATTERNS:
+            spans.extend((m.start(), m.end(), skill) for m in pattern.finditer(text_lower))
+        
+        # Non-skills stay in the gaps, so they break an alternation
+        spans = [
+            span for span in spans
+            if span[2] not in STOP_WORDS and span[2] not in EXPLICIT_NON_SKILLS and len(span[2]) >= 2
+        ]
+        return leftmost_longest(spans)
+    
+    def _add_or_group(self, or_groups, seen, run):
+        """Record a run of alternative skills (two or more distinct, first occurrence only)"""
+        members = list(dict.fromkeys(run))
+        if len(members) < 2:
+            return
+        
+        group_key = frozenset(members)
+        if group_key not in seen:
+            seen.add(group_key)
+            or_groups[f"group_{len(or_groups)}"] = members
     
     def _expand_skills_with_implications(self, cv_skills):
         """
         CRITICAL FIX: Expand CV skills to include implied skills
         E.g., if CV has "Tableau", add "data visualization"
         """
-        expanded_skills = set(cv_skills)
-        
-        for skill in cv_skills:
-            if skill in self.skill_implies:
-                implied = self.skill_implies[skill]
-                expanded_skills.update(implied)
-        
-        return expanded_skills
+        return self.skill_graph.expand(cv_skills)
     
     def calculate_skill_priority(self, jd_text):
         """
@@ -532,22 +624,26 @@ class EnterpriseATSMatcher:
         """
         must_have = set()
         nice_to_have = set()
-        or_groups = self._detect_skill_groups(jd_text)
+        # One automaton pass feeds OR-group detection and skill extraction
+        with stage('skill_occurrences', len(jd_text)):
+            occurrences = get_synonym_patterns().occurrences(jd_text.lower())
+        
+        with stage('or_groups', len(jd_text)):
+            or_groups = self._detect_skill_groups(jd_text, occurrences)
         
-        all_skills = self.extract_skills_advanced(jd_text, context="jd")
+        with stage('extract_skills', len(jd_text)):
+            all_skills, skills_by_sentence = self.extract_sentence_skills(jd_text, occurrences)
         
         # Stronger must-have keywords
         must_keywords = ['must have', 'required', 'mandatory', 'essential', 'must know']
         nice_keywords = ['nice to have', 'preferred', 'desired', 'plus', 'bonus', 'optional', 'advantage']
         
-        sentences = re.split(r'[.!\n]+', jd_text.lower())
+        sentences = SENTENCE_BREAKS.split(jd_text.lower())
         
-        for sentence in sentences:
+        for sentence, sentence_skills in zip(sentences, skills_by_sentence):
             is_must = any(keyword in sentence for keyword in must_keywords)
             is_nice = any(keyword in sentence for keyword in nice_keywords)
             
-            sentence_skills = self.extract_skills_advanced(sentence, context="jd")
-            
             if is_nice:
                 nice_to_have.update(sentence_skills & all_skills)
             elif is_must:
@@ -586,7 +682,8 @@ class EnterpriseATSMatcher:
         return {
             'must_have': must_have,
             'nice_to_have': nice_to_have,
-            'or_groups': or_groups
+            'or_groups': or_groups,
+            'all_skills': all_skills
         }
     
     def _calculate_skill_similarity(self, required_skill, candidate_skills):
@@ -594,123 +691,325 @@ class EnterpriseATSMatcher:
         Calculate similarity between a required skill and candidate's skills
         Returns 0.0 to 1.0 (partial credit for related skills)
         """
-        # Exact match
-        if required_skill in candidate_skills:
-            return 1.0
-        
-        # CRITICAL: Check if candidate has equivalent tool in same category
-        equivalent_tools = {
-            'tableau': ['power bi', 'qlikview', 'looker'],
-            'power bi': ['tableau', 'qlikview', 'looker'],
-            'qlikview': ['tableau', 'power bi', 'looker'],
-            'react': ['angular', 'vue', 'svelte'],
-            'angular': ['react', 'vue', 'svelte'],
-            'vue': ['react', 'angular', 'svelte'],
-            'mysql': ['postgresql', 'sql server', 'oracle database'],
-            'postgresql': ['mysql', 'sql server', 'oracle database'],
-            'mongodb': ['dynamodb', 'couchdb', 'cassandra'],
-            'docker': ['podman', 'containerd'],
-            'jenkins': ['gitlab ci', 'github actions', 'circle ci'],
-            'terraform': ['cloudformation', 'pulumi'],
-            'aws': ['azure', 'google cloud platform'],
-            'amazon web services': ['microsoft azure', 'google cloud platform'],
-            'microsoft azure': ['amazon web services', 'google cloud platform'],
-        }
+        return self.skill_graph.similarity([required_skill], candidate_skills).item()
+    
+    def compile_job_profile(self, job_description):
+        """Parse a job description into a reusable JobProfile"""
+        with stage('job_profile', len(job_description)):
+            skill_priority = self.calculate_skill_priority(job_description)
+            return JobProfile(
+                job_description,
+                must_have=skill_priority['must_have'],
+                nice_to_have=skill_priority['nice_to_have'],
+                or_groups=skill_priority['or_groups'],
+                all_skills=skill_priority['all_skills'],
+                vocabulary=self.vocabulary,
+            )
+    
+    def get_job_profile(self, job_description):
+        """
+        Compiled profile for a job description (LRU cached)
+        Repeated calls with the same JD skip all JD parsing
+        """
+        if isinstance(job_description, JobProfile):
+            return job_description
+        
+        key = job_profile_key(job_description)
+        profile = self._job_profiles.get(key)
+        if profile is not None:
+            self._job_profiles.move_to_end(key)
+            return profile
+        
+        profile = self.compile_job_profile(job_description)
+        self._job_profiles[key] = profile
+        while len(self._job_profiles) > JOB_PROFILE_CACHE_SIZE:
+            self._job_profiles.popitem(last=False)
+        return profile
+    
+    def analyze_resumes(self, profile, resume_texts, batch_size=EMBEDDING_BATCH_SIZE, timings=None):
+        """
+        Analyze many resumes against one job description
+        Embeddings for the whole batch are computed in one pass
+        timings: optional StageTimings; each result then carries its own
+        'timings' block and the batch totals are accumulated into it
+        """
+        if timings is None:
+            profile = self.get_job_profile(profile)
+            semantic = self.semantic_similarity_batch(profile, resume_texts, batch_size)
+            return [
+                self.analyze_resume(profile, resume_text, semantic_analysis=semantic_analysis)
+                for resume_text, semantic_analysis in zip(resume_texts, semantic)
+            ]
+        
+        with timings.activate():
+            profile = self.get_job_profile(profile)
+            with stage('semantic', sum(map(len, resume_texts))):
+                semantic = self.semantic_similarity_batch(profile, resume_texts, batch_size)
+        
+        results = []
+        for resume_text, semantic_analysis in zip(resume_texts, semantic):
+            result = self.analyze_resume(profile, resume_text, semantic_analysis=semantic_analysis,
+                                         collect_timings=True)
+            timings.merge(result['timings'])
+            results.append(result)
+        return results
+    
+    def prepare_batch(self, resume_texts):
+        """
+        Job-independent CandidateBatch for many (normalized) resumes
+        Skills and experience are extracted here once; embeddings are
+        added on the first semantic scoring and then reused for every JD
+        """
+        if isinstance(resume_texts, CandidateBatch):
+            return resume_texts
         
-        # If candidate has equivalent tool, give HIGH partial credit (0.95)
-        if required_skill in equivalent_tools:
-            for equiv in equivalent_tools[required_skill]:
-                if equiv in candidate_skills:
-                    return 0.95  # Almost full credit for equivalent tools
-        
-        # Check for related skills (partial credit)
-        related_skills = {
-            'python': ['django', 'flask', 'fastapi', 'pandas', 'numpy'],
-            'javascript': ['react', 'angular', 'vue', 'node.js', 'typescript'],
-            'web development': ['react', 'angular', 'vue', 'html', 'css', 'node.js'],
-            'database management': ['mysql', 'postgresql', 'mongodb', 'sql'],
-            'cloud computing': ['amazon web services', 'microsoft azure', 'google cloud platform'],
-            'data science': ['machine learning', 'data analytics', 'pandas', 'numpy'],
-            'machine learning': ['tensorflow', 'pytorch', 'scikit-learn'],
-        }
+        resume_texts = list(resume_texts)
+        chars = sum(map(len, resume_texts))
+        with stage('extract_skills', chars):
+            raw_skills = [self.extract_skills_advanced(text, context="resume") for text in resume_texts]
         
-        # If candidate has related skills, give moderate partial credit
-        if required_skill in related_skills:
-            matching_related = set(related_skills[required_skill]) & candidate_skills
-            if matching_related:
-                return 0.7  # 70% credit for related skills
+        with stage('experience', chars):
+            skill_years = [experience_years(text, sorted(skills)) for text, skills in zip(resume_texts, raw_skills)]
         
-        # Check reverse (candidate has broader skill)
-        for broad_skill, specific_skills in related_skills.items():
-            if required_skill in specific_skills and broad_skill in candidate_skills:
-                return 0.8  # 80% credit for having broader skill
+        return self.build_batch(resume_texts, raw_skills, skill_years)
+    
+    def build_batch(self, resume_texts, raw_skills, skill_years):
+        """
+        CandidateBatch from skills already extracted per resume
+        skill_years: {skill: years} per resume (experience_years() output)
+        """
+        skill_matrix = self.vocabulary.matrix(raw_skills)
+        years = np.zeros(skill_matrix.shape, dtype=np.int8)
+        for row, found in enumerate(skill_years):
+            for skill, value in found.items():
+                if value and skill in self.vocabulary:
+                    years[row, self.vocabulary.ids[skill]] = value
+        
+        return CandidateBatch(list(resume_texts), raw_skills, skill_matrix, years)
+    
+    def embed_batch(self, batch, batch_size=EMBEDDING_BATCH_SIZE, sections=None):
+        """
+        Resume and section embeddings of a CandidateBatch (computed once)
+        sections: SectionIndex per resume, when already segmented
+        """
+        if batch.semantic_vectors is None:
+            batch.semantic_vectors, batch.semantic_owners = self._semantic_vectors(
+                batch.resume_texts, batch_size, sections
+            )
+        return batch
+    
+    def score_batch(self, profile, candidates, batch_size=EMBEDDING_BATCH_SIZE, weights=None):
+        """
+        Score every candidate against one job description with matrix ops
+        candidates: CandidateBatch (re-ranking reuses it), or resume texts
+        weights: overrides for SCORING_WEIGHTS
+        Returns per-candidate arrays (same values as analyze_resume) plus
+        the match_skills() result and semantic analyses used to build them
+        """
+        profile = self.get_job_profile(profile)
+        batch = self.prepare_batch(candidates)
+        count = len(batch)
+        
+        with stage('skill_matching'):
+            matches = self.match_skills(profile, batch.skill_matrix)
+        
+        with stage('scoring'):
+            # OR groups: satisfied by any member, else the best member's partial credit
+            starts = profile.or_group_starts
+            if profile.or_groups:
+                or_hits = np.logical_or.reduceat(matches['or_members'], starts, axis=1)
+                or_best = np.maximum.reduceat(matches['or_member_credit'], starts, axis=1)
+            else:
+                or_hits = np.zeros((count, 0), dtype=bool)
+                or_best = np.zeros((count, 0))
+            must_hits = matches['must_have']
+            
+            total_requirements = len(profile.must_have) + len(profile.or_groups)
+            if total_requirements == 0:
+                must_have_score = np.full(count, 100.0)
+            else:
+                partial = np.concatenate([
+                    np.where(or_hits, 0.0, or_best),
+                    np.where(must_hits, 0.0, matches['must_have_credit']),
+                ], axis=1)
+                # Added column by column, in the order analyze_resume sums them
+                partial_credit = np.zeros(count)
+                for column in partial.T:
+                    partial_credit += column
+                matched_requirements = must_hits.sum(axis=1) + or_hits.sum(axis=1) + partial_credit
+                must_have_score = np.minimum(matched_requirements / total_requirements * 100, 100.0)
+            
+            if profile.nice_to_have:
+                nice_to_have_score = matches['nice_to_have'].sum(axis=1) / len(profile.nice_to_have) * 100
+            else:
+                nice_to_have_score = np.zeros(count)
+            
+            # Years only exist for extracted skills, so this sums the explicit matches
+            claimed = profile.claimable_ids
+            total_years = batch.years[:, claimed].sum(axis=1, dtype=np.int64)
+            matched_count = matches['expanded'][:, claimed].sum(axis=1)
+            avg_experience = total_years / np.maximum(matched_count, 1)
+            experience_bonus = np.select(
+                [avg_experience >= 5, avg_experience >= 3, avg_experience >= 1], [15.0, 10.0, 5.0], 0.0
+            )
+            
+            skill_coverage = np.minimum(batch.skill_counts / max(len(profile.all_skills), 1) * 100, 100.0)
+        
+        with stage('semantic', sum(map(len, batch.resume_texts))):
+            self.embed_batch(batch, batch_size)
+            semantic = self._score_semantic_vectors(
+                profile.embedding, batch.semantic_vectors, batch.semantic_owners, count
+            )
+        semantic_score = np.array([analysis['overall'] for analysis in semantic], dtype=np.float64)
+        
+        final_score = combine_scores({
+            'must_have': must_have_score,
+            'semantic': semantic_score,
+            'nice_to_have': nice_to_have_score,
+            'experience': experience_bonus,
+            'coverage': skill_coverage,
+        }, weights)
         
-        return 0.0
+        return {
+            'overall_score': np.array([round(min(x, 100), 2) for x in final_score.tolist()]),
+            'must_have_score': must_have_score,
+            'nice_to_have_score': nice_to_have_score,
+            'semantic_score': semantic_score,
+            'experience_bonus': experience_bonus,
+            'skill_coverage': skill_coverage,
+            'matches': matches,
+            'semantic': semantic,
+        }
+    
+    def analyze_batch(self, profile, candidates, batch_size=EMBEDDING_BATCH_SIZE, weights=None):
+        """
+        Vectorized analyze_resumes: same results, scored as one matrix
+        candidates: CandidateBatch from prepare_batch() (keep it to re-rank
+        the same pool against other JDs), or resume texts
+        """
+        profile = self.get_job_profile(profile)
+        batch = self.prepare_batch(candidates)
+        scores = self.score_batch(profile, batch, batch_size, weights)
+        
+        results = []
+        for row in range(len(batch)):
+            details = self._requirement_details(profile, scores['matches'], row)
+            raw_skills = batch.raw_skills[row]
+            experience_scores = {}
+            for skill in details['must_have_matched']:
+                if skill in raw_skills and skill in self.vocabulary:
+                    years = int(batch.years[row, self.vocabulary.ids[skill]])
+                    if years > 0:
+                        experience_scores[skill] = years
+            
+            features = {
+                'must_have_score': float(scores['must_have_score'][row]),
+                'nice_to_have_score': float(scores['nice_to_have_score'][row]) if profile.nice_to_have else 0,
+                'experience_bonus': float(scores['experience_bonus'][row]),
+                # Same expression as skill_features(): an int 100 when capped
+                'skill_coverage': min(int(batch.skill_counts[row]) / max(len(profile.all_skills), 1) * 100, 100),
+                'must_have_matched': details['must_have_matched'],
+                'must_have_missing': details['must_have_missing'],
+                'partial_matches': details['partial_matches'],
+                'nice_to_have_matched': details['nice_to_have_matched'],
+                'nice_to_have_missing': details['nice_to_have_missing'],
+                'experience_scores': experience_scores,
+            }
+            results.append(self.score_features(profile, features, scores['semantic'][row], weights))
+        return results
     
-    def analyze_resume(self, job_description, resume_text):
+    def analyze_resume(self, profile, resume_text, semantic_analysis=None, collect_timings=False):
         """
         BALANCED: Fair matching with partial credit for related skills
+        profile: JobProfile, or the job description text
+        semantic_analysis: precomputed semantic_similarity_scored() result
+        collect_timings: add a per-stage 'timings' block to the result
         """
-        # Extract skills
-        jd_skills_all = self.extract_skills_advanced(job_description, context="jd")
-        cv_skills_raw = self.extract_skills_advanced(resume_text, context="resume")
+        if collect_timings:
+            timings = StageTimings()
+            with timings.activate():
+                result = self.analyze_resume(profile, resume_text, semantic_analysis)
+            result['timings'] = timings.as_dict()
+            return result
         
-        # Expand CV skills with implications
-        cv_skills_all = self._expand_skills_with_implications(cv_skills_raw)
+        profile = self.get_job_profile(profile)
+        features = self.extract_features(profile, resume_text)
         
-        skill_priority = self.calculate_skill_priority(job_description)
-        must_have = skill_priority['must_have']
-        nice_to_have = skill_priority['nice_to_have']
-        or_groups = skill_priority['or_groups']
+        # Semantic similarity
+        if semantic_analysis is None:
+            with stage('semantic', len(resume_text)):
+                semantic_analysis = self.semantic_similarity_scored(
+                    profile.job_description, resume_text, jd_embedding=profile.embedding
+                )
+        
+        with stage('scoring'):
+            return self.score_features(profile, features, semantic_analysis)
+    
+    def extract_features(self, profile, resume_text):
+        """
+        Skill and experience features of one resume against a profile
+        Everything analyze_resume needs except the semantic stage, so it
+        can run in worker processes without loading the embedding model
+        """
+        profile = self.get_job_profile(profile)
         
-        # Process matching with partial credit
-        must_have_matched = set()
-        must_have_missing = set()
-        partial_matches = {}  # Track partial credit
+        # Extract skills
+        with stage('extract_skills', len(resume_text)):
+            cv_skills_raw = self.extract_skills_advanced(resume_text, context="resume")
         
-        # Step 1: Process OR groups
-        for group_id, group_skills in or_groups.items():
-            matched_from_group = [s for s in group_skills if s in cv_skills_all]
-            
-            if matched_from_group:
-                must_have_matched.update(matched_from_group)
-            else:
-                # Check for partial matches in OR group
-                best_similarity = 0.0
-                for skill in group_skills:
-                    similarity = self._calculate_skill_similarity(skill, cv_skills_all)
-                    best_similarity = max(best_similarity, similarity)
-                
-                if best_similarity > 0.0:
-                    partial_matches[f"({' or '.join(group_skills)})"] = best_similarity
-                else:
-                    must_have_missing.add(f"({' or '.join(group_skills)})")
+        with stage('skill_matching'):
+            skill_matches = self.match_skills(profile, self.vocabulary.matrix([cv_skills_raw]))
         
-        # Step 2: Process individual skills with partial credit
-        for skill in must_have:
-            if skill in cv_skills_all:
-                must_have_matched.add(skill)
-            else:
-                # Check for partial match
-                similarity = self._calculate_skill_similarity(skill, cv_skills_all)
-                if similarity > 0.0:
-                    partial_matches[skill] = similarity
-                else:
-                    must_have_missing.add(skill)
+        return self.skill_features(profile, resume_text, cv_skills_raw, skill_matches)
+    
+    def match_skills(self, profile, skill_matrix):
+        """
+        Vectorized requirement matching for a batch of candidates
+        skill_matrix: (candidates, vocabulary) boolean rows of extracted skills
+        Implications are expanded for all rows at once; every OR-group
+        member, must-have and nice-to-have becomes a column of hits, and
+        partial credit is scored for all requirements in one pass
+        """
+        profile = self.get_job_profile(profile)
+        expanded = self.skill_graph.expand_matrix(skill_matrix)
         
-        nice_to_have_matched = nice_to_have.intersection(cv_skills_all)
-        nice_to_have_missing = nice_to_have - cv_skills_all
+        def present(ids):
+            known = ids >= 0
+            return expanded[:, np.where(known, ids, 0)] & known
         
-        # Experience weighting (only for raw skills, not implied)
-        experience_scores = {}
-        for skill in must_have_matched:
-            if skill in cv_skills_raw:  # Only if explicitly mentioned
-                years = self.calculate_experience_weight(resume_text, skill)
-                if years > 0:
-                    experience_scores[skill] = years
+        requirement_ids = np.concatenate([profile.or_member_ids, profile.must_have_ids])
+        credit = self.skill_graph.similarity_matrix(requirement_ids, expanded)
+        split = len(profile.or_member_ids)
+        return {
+            'expanded': expanded,
+            'or_members': present(profile.or_member_ids),
+            'must_have': present(profile.must_have_ids),
+            'nice_to_have': present(profile.nice_to_have_ids),
+            'or_member_credit': credit[:, :split],
+            'must_have_credit': credit[:, split:],
+        }
+    
+    def skill_features(self, profile, resume_text, cv_skills_raw, skill_matches, row=0):
+        """Features of one candidate (row) of a match_skills() result"""
+        profile = self.get_job_profile(profile)
+        jd_skills_all = profile.all_skills
+        
+        must_have = profile.must_have
+        nice_to_have = profile.nice_to_have
+        or_groups = profile.or_groups
+        
+        details = self._requirement_details(profile, skill_matches, row)
+        must_have_matched = details['must_have_matched']
+        partial_matches = details['partial_matches']
+        nice_to_have_matched = details['nice_to_have_matched']
+        individual_matched = details['individual_matched']
+        or_groups_matched = details['or_groups_matched']
         
-        # Semantic similarity
-        semantic_analysis = self.semantic_similarity_scored(job_description, resume_text)
+        # Experience weighting (only for raw skills, not implied)
+        explicit_skills = [s for s in must_have_matched if s in cv_skills_raw]
+        with stage('experience', len(resume_text)):
+            years_by_skill = self.calculate_experience_weights(resume_text, explicit_skills)
+        experience_scores = {s: years for s, years in years_by_skill.items() if years > 0}
         
         # Calculate weighted scores with PARTIAL CREDIT
         total_requirements = len(must_have) + len(or_groups)
@@ -718,10 +1017,7 @@ class EnterpriseATSMatcher:
         if total_requirements == 0:
             must_have_score = 100.0
         else:
-            # Full credit for exact matches
-            individual_matched = len([s for s in must_have if s in must_have_matched])
-            or_groups_matched = sum(1 for g in or_groups.values() if any(s in cv_skills_all for s in g))
-            
+            # Full credit for exact matches (individual_matched, or_groups_matched)
             # Partial credit for related skills
             partial_credit = sum(partial_matches.values())
             
@@ -731,9 +1027,6 @@ class EnterpriseATSMatcher:
         # Nice-to-have score (bonus, not penalty if missing)
         nice_to_have_score = (len(nice_to_have_matched) / len(nice_to_have) * 100) if nice_to_have else 0
         
-        # Semantic similarity
-        semantic_score = semantic_analysis['overall']
-        
         # Experience bonus (realistic cap at 15 points)
         total_exp_years = sum(experience_scores.values())
         avg_experience = total_exp_years / max(len(must_have_matched), 1)
@@ -747,29 +1040,129 @@ class EnterpriseATSMatcher:
         else:
             experience_bonus = 0.0   # Entry level or no experience data
         
-        # BALANCED SCORING FORMULA
+        # Skill coverage relative to the JD (resume completeness component)
+        skill_coverage = min(len(cv_skills_raw) / max(len(jd_skills_all), 1) * 100, 100)
+        
+        return {
+            'must_have_score': must_have_score,
+            'nice_to_have_score': nice_to_have_score,
+            'experience_bonus': experience_bonus,
+            'skill_coverage': skill_coverage,
+            'must_have_matched': must_have_matched,
+            'must_have_missing': details['must_have_missing'],
+            'partial_matches': partial_matches,
+            'nice_to_have_matched': nice_to_have_matched,
+            'nice_to_have_missing': details['nice_to_have_missing'],
+            'experience_scores': experience_scores,
+        }
+    
+    def _requirement_details(self, profile, skill_matches, row):
+        """Matched / missing / partial requirement names of one match_skills() row"""
+        or_groups = profile.or_groups
+        
+        or_present = skill_matches['or_members'][row].tolist()
+        or_credit = skill_matches['or_member_credit'][row].tolist()
+        
+        # Process matching with partial credit
+        must_have_matched = set()
+        must_have_missing = set()
+        partial_matches = {}  # Track partial credit
+        
+        # Step 1: Process OR groups
+        or_groups_matched = 0
+        member = 0
+        for group_id, group_skills in or_groups.items():
+            members = range(member, member + len(group_skills))
+            member += len(group_skills)
+            matched_from_group = [s for s, i in zip(group_skills, members) if or_present[i]]
+            
+            if matched_from_group:
+                must_have_matched.update(matched_from_group)
+                or_groups_matched += 1
+            else:
+                # Check for partial matches in OR group
+                best_similarity = 0.0
+                for i in members:
+                    best_similarity = max(best_similarity, or_credit[i])
+                
+                if best_similarity > 0.0:
+                    partial_matches[f"({' or '.join(group_skills)})"] = best_similarity
+                else:
+                    must_have_missing.add(f"({' or '.join(group_skills)})")
+        
+        # Step 2: Process individual skills with partial credit
+        individual_matched = 0
+        for skill, present, similarity in zip(profile.must_have_order,
+                                              skill_matches['must_have'][row].tolist(),
+                                              skill_matches['must_have_credit'][row].tolist()):
+            if present:
+                must_have_matched.add(skill)
+                individual_matched += 1
+            elif similarity > 0.0:
+                # Partial match
+                partial_matches[skill] = similarity
+            else:
+                must_have_missing.add(skill)
+        
+        nice_present = skill_matches['nice_to_have'][row].tolist()
+        nice_to_have_matched = {s for s, hit in zip(profile.nice_to_have_order, nice_present) if hit}
+        nice_to_have_missing = {s for s, hit in zip(profile.nice_to_have_order, nice_present) if not hit}
+        
+        return {
+            'must_have_matched': must_have_matched,
+            'must_have_missing': must_have_missing,
+            'partial_matches': partial_matches,
+            'nice_to_have_matched': nice_to_have_matched,
+            'nice_to_have_missing': nice_to_have_missing,
+            'individual_matched': individual_matched,
+            'or_groups_matched': or_groups_matched,
+        }
+    
+    def score_features(self, profile, features, semantic_analysis, weights=None):
+        """
+        Combine extracted features and semantic similarity into the final result
+        weights: overrides for SCORING_WEIGHTS
+        """
+        profile = self.get_job_profile(profile)
+        
+        must_have_score = features['must_have_score']
+        nice_to_have_score = features['nice_to_have_score']
+        experience_bonus = features['experience_bonus']
+        must_have_matched = features['must_have_matched']
+        must_have_missing = features['must_have_missing']
+        partial_matches = features['partial_matches']
+        nice_to_have_matched = features['nice_to_have_matched']
+        nice_to_have_missing = features['nice_to_have_missing']
+        experience_scores = features['experience_scores']
+        
+        # Semantic similarity
+        semantic_score = semantic_analysis['overall']
+        
+        # BALANCED SCORING FORMULA (weights: config.SCORING_WEIGHTS)
         # Must-have: 50% (core requirement)
         # Semantic: 20% (context and fit)
         # Nice-to-have: 10% (bonus skills)
         # Experience: 15% (seniority level)
         # Completeness: 5% (resume quality)
-        final_score = (
-            must_have_score * 0.50 +
-            semantic_score * 0.20 +
-            nice_to_have_score * 0.10 +
-            experience_bonus * 1.0 +
-            min(len(cv_skills_raw) / max(len(jd_skills_all), 1) * 100, 100) * 0.05
-        )
+        # Unrounded components are kept so results can be re-weighted later
+        components = {
+            'must_have': must_have_score,
+            'semantic': semantic_score,
+            'nice_to_have': nice_to_have_score,
+            'experience': experience_bonus,
+            'coverage': features['skill_coverage'],
+        }
         
         # Generate insights
         insights = self._generate_insights(
             must_have_matched, must_have_missing,
             nice_to_have_matched, semantic_score,
-            experience_scores, or_groups, partial_matches
+            experience_scores, profile.or_groups, partial_matches
         )
         
         return {
-            'overall_score': round(min(final_score, 100), 2),
+            'overall_score': overall_score(components, weights),
+            'components': components,
             'breakdown': {
                 'must_have_skills': round(must_have_score, 2),
                 'nice_to_have_skills': round(nice_to_have_score, 2),
@@ -784,7 +1177,7 @@ class EnterpriseATSMatcher:
             'experience_details': experience_scores,
             'insights': insights,
             'section_scores': semantic_analysis.get('sections', {}),
-            'or_groups_detected': or_groups
+            'or_groups_detected': profile.or_groups
         }
     
     def _generate_insights(self, must_matched, must_missing, nice_matched, 
@@ -851,8 +1244,10 @@ class EnterpriseATSMatcher:
         return insights
 
 
-# Singleton instance
+# Singleton instances
 _matcher = None
+_embedding_store = None
+_embedding_store_failed = False
 
 def get_matcher():
     global _matcher
@@ -861,7 +1256,51 @@ def get_matcher():
     return _matcher
 
 
-def analyze_resume(job_description, resume_text):
-    """Main entry point for analysis"""
+def get_embedding_store():
+    """Shared on-disk embedding cache, or None when disabled/unavailable"""
+    global _embedding_store, _embedding_store_failed
+    if _embedding_store is None and not _embedding_store_failed:
+        if EMBEDDING_CACHE_MB <= 0:
+            _embedding_store_failed = True
+            return None
+        try:
+            _embedding_store = EmbeddingStore(
+                os.path.join(CACHE_DIR, 'embeddings', EMBEDDING_MODEL_NAME),
+                EMBEDDING_MODEL_NAME,
+                get_embedding_dimension(EMBEDDING_MODEL_NAME),
+                max_mb=EMBEDDING_CACHE_MB,
+            )
+        except OSError as e:
+            print(f"Embedding cache disabled: {e}", file=sys.stderr)
+            _embedding_store_failed = True
+    return _embedding_store
+
+
+def get_job_profile(job_description):
+    """Compiled (cached) JobProfile for a job description"""
+    return get_matcher().get_job_profile(job_description)
+
+
+def analyze_resume(profile, resume_text, collect_timings=False):
+    """
+    Main entry point for analysis
+    profile: JobProfile from get_job_profile(), or the job description text
+    """
     matcher = get_matcher()
-    return matcher.analyze_resume(job_description, resume_text)
\ No newline at end of file
+    return matcher.analyze_resume(profile, resume_text, collect_timings=collect_timings)
+
+
+def analyze_resumes(profile, resume_texts, batch_size=EMBEDDING_BATCH_SIZE, timings=None):
+    """Batch entry point: one embedding pass for all resumes"""
+    matcher = get_matcher()
+    return matcher.analyze_resumes(profile, resume_texts, batch_size, timings=timings)
+
+
+def prepare_batch(resume_texts):
+    """Reusable CandidateBatch for ranking one pool against many JDs"""
+    return get_matcher().prepare_batch(resume_texts)
+
+
+def analyze_batch(profile, candidates, batch_size=EMBEDDING_BATCH_SIZE, weights=None):
+    """Vectorized batch entry point: all candidates scored as one skill matrix"""
+    return get_matcher().analyze_batch(profile, candidates, batch_size, weights)
@@ -0,0 +1,59 @@
+"""
+Model Registry
+Lazily loaded NLP models shared by the matcher and the apps
+Nothing is imported, loaded or downloaded until a feature asks for it
+"""
+import threading
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+SPACY_MODEL_NAME = 'en_core_web_sm'
+
+# Known output sizes, so cached embeddings can be served without loading the model
+EMBEDDING_DIMENSIONS = {
+    'all-MiniLM-L6-v2': 384,
+}
+
+_models = {}
+_lock = threading.RLock()
+
+
+def get_sentence_model(name=EMBEDDING_MODEL_NAME):
+    """SentenceTransformer instance, loaded on first use"""
+    key = ('sentence_transformers', name)
+    with _lock:
+        if key not in _models:
+            from sentence_transformers import SentenceTransformer
+            _models[key] = SentenceTransformer(name)
+        return _models[key]
+
+
+def get_embedding_dimension(name=EMBEDDING_MODEL_NAME):
+    """Embedding size for a model (loads it only if the size is unknown)"""
+    if name in EMBEDDING_DIMENSIONS:
+        return EMBEDDING_DIMENSIONS[name]
+    return get_sentence_model(name).get_sentence_embedding_dimension()
+
+
+def get_spacy_model(name=SPACY_MODEL_NAME):
+    """
+    spaCy pipeline, loaded on first use
+    Never downloads: install once with `python -m spacy download <name>`
+    """
+    key = ('spacy', name)
+    with _lock:
+        if key not in _models:
+            import spacy
+            try:
+                _models[key] = spacy.load(name)
+            except OSError as e:
+                raise RuntimeError(
+                    f"spaCy model '{name}' is not installed. "
+                    f"Run: python -m spacy download {name}"
+                ) from e
+        return _models[key]
+
+
+def loaded_models():
+    """Names of the models loaded in this process"""
+    with _lock:
+        return [f"{kind}:{name}" for kind, name in _models]
@@ -0,0 +1,332 @@
+"""
+Resume Ingestion Pipeline
+Parallel parse -> normalize/extract -> batch-embed stages
+
+- parse:    pdfminer / python-docx in worker processes (skipped for files
+            already in the parsed-resume cache)
+- prepare:  normalization, metadata and skill features in worker processes
+- embed:    one thread batches semantic scoring (the model is loaded once)
+
+Results stream back as soon as each resume finishes, not in upload order
+"""
+import io
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from utils import (
+    extract_text_from_file, extract_emails, extract_phone_numbers,
+    extract_years_of_experience, extract_education_level,
+    calculate_resume_completeness, extract_certifications, normalize_text
+)
+from matcher import get_matcher, EMBEDDING_BATCH_SIZE
+from document_cache import get_parsed_cache, document_key
+from config import PARSE_TIMEOUT_SECONDS
+from sections import segment_sections
+from profiling import StageTimings, stage
+
+# Resumes shorter than this (after normalization) are reported but not scored
+MIN_SCORABLE_CHARS = 100
+
+# Seconds between cancellation checks while waiting on workers
+CANCEL_POLL_SECONDS = 0.2
+
+
+def worker_context():
+    """
+    Start method for worker processes: forkserver (spawn where unavailable)
+    Forking the multi-threaded Streamlit server or a job thread after the
+    model is loaded can deadlock a child on a lock another thread held
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def worker_pool(workers=None):
+    """Process pool for the CPU stages (one process per core by default)"""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=worker_context())
+
+
+def parse_document(name, data):
+    """
+    Stage 1: raw text from file bytes or a file path
+    Returns (document, error); document is the cached parse when the file
+    content was seen before, else {'key': cache key, 'raw_text': ...}
+    """
+    cache = get_parsed_cache()
+    key = None
+    if cache is not None:
+        with stage('parse_cache'):
+            if isinstance(data, (bytes, bytearray)):
+                key = document_key(data)
+            elif os.path.exists(data):
+                with open(data, 'rb') as f:
+                    key = document_key(f.read())
+            cached = cache.get(key) if key else None
+        if cached is not None:
+            return cached, None
+    
+    if isinstance(data, (bytes, bytearray)):
+        size = len(data)
+        data = io.BytesIO(data)
+        data.name = name
+    else:
+        size = os.path.getsize(data) if os.path.exists(data) else 0
+    with stage('parse', size):
+        raw_text, error = extract_text_from_file(data, timeout=PARSE_TIMEOUT_SECONDS)
+    return {'key': key, 'raw_text': raw_text}, error
+
+
+def parse_resume_text(raw_text):
+    """
+    Normalized text and metadata of a resume (the cached part of a parse)
+    Contact details are read from the raw text, everything else from the
+    normalized text (same order as the single-threaded app)
+    Returns (document, SectionIndex of the normalized text)
+    """
+    with stage('normalize', len(raw_text)):
+        resume_text = normalize_text(raw_text, preserve_structure=True)
+    with stage('sections', len(resume_text)):
+        sections = segment_sections(resume_text)
+    with stage('metadata', len(resume_text)):
+        document = {
+            'raw_text': raw_text,
+            'resume_text': resume_text,
+            'emails': extract_emails(raw_text),
+            'phones': extract_phone_numbers(raw_text),
+            'total_exp': extract_years_of_experience(resume_text),
+            'education': extract_education_level(resume_text, sections),
+            'completeness': calculate_resume_completeness(resume_text, sections),
+            'certs': extract_certifications(resume_text),
+        }
+    return document, sections
+
+
+def load_resume(document):
+    """
+    Parsed document and the SectionIndex of its normalized text
+    document: parse_document() output; fresh parses are added to the cache
+    """
+    if 'resume_text' not in document:
+        key = document['key']
+        document, sections = parse_resume_text(document['raw_text'])
+        cache = get_parsed_cache()
+        if key and cache is not None:
+            with stage('parse_cache'):
+                cache.put(key, document)
+    else:
+        with stage('sections', len(document['resume_text'])):
+            sections = segment_sections(document['resume_text'])
+    return document, sections
+
+
+def prepare_resume(name, document, profile):
+    """
+    Stage 2: normalized text, contact metadata and skill features
+    document: parse_document() output; fresh parses are added to the cache
+    """
+    document, sections = load_resume(document)
+    resume_text = document['resume_text']
+    record = {
+        'file_name': name,
+        'resume_text': resume_text,
+        'emails': document['emails'],
+        'phones': document['phones'],
+        'total_exp': document['total_exp'],
+        'education': document['education'],
+        'completeness': document['completeness'],
+        'certs': document['certs'],
+        'features': None,
+        'analysis': None,
+        'error': None,
+    }
+    if len(resume_text) >= MIN_SCORABLE_CHARS:
+        record['sections'] = sections
+        record['features'] = get_matcher().extract_features(profile, resume_text)
+    return record
+
+
+def embed_and_score(profile, records, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Stage 3: one semantic batch for all records, then final scores
+    Records carrying a 'timings' StageTimings get a 'timings' block in
+    their analysis
+    """
+    matcher = get_matcher()
+    texts = [r['resume_text'] for r in records]
+    sections = [r.pop('sections') for r in records]
+    with stage('semantic', sum(map(len, texts))):
+        semantic = matcher.semantic_similarity_batch(profile, texts, batch_size, sections)
+    for record, semantic_analysis in zip(records, semantic):
+        timings = record.pop('timings', None)
+        if timings is None:
+            record['analysis'] = matcher.score_features(profile, record.pop('features'), semantic_analysis)
+            continue
+        with timings.activate(), stage('scoring'):
+            record['analysis'] = matcher.score_features(profile, record.pop('features'), semantic_analysis)
+        record['analysis']['timings'] = timings.as_dict()
+    return records
+
+
+def run_timed(timings, func, *args):
+    """Run func with timings active; returns (result, timings) across processes"""
+    with timings.activate():
+        return func(*args), timings
+
+
+class ResumePipeline:
+    """
+    Streams analysis results for a batch of uploaded documents
+    CPU stages share one process pool (every core busy, no oversubscription);
+    embedding runs on a single thread so the model is only loaded once
+    pool: process pool shared with other pipelines (left running); by
+    default each run() starts its own pool of `workers` processes
+    """
+
+    def __init__(self, profile, workers=None, batch_size=EMBEDDING_BATCH_SIZE, collect_timings=False,
+                 pool=None):
+        # Batch-wide stage counters (None unless collect_timings)
+        self.timings = StageTimings() if collect_timings else None
+        if self.timings is not None:
+            with self.timings.activate():
+                self.profile = get_matcher().get_job_profile(profile)
+        else:
+            self.profile = get_matcher().get_job_profile(profile)
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = pool
+        self.batch_size = batch_size
+        # Documents read ahead of the workers (bounds memory on huge runs)
+        self.max_in_flight = max(self.workers * 4, batch_size * 2)
+
+    def _submit(self, pool, timings, func, *args):
+        if self.timings is None:
+            return pool.submit(func, *args)
+        return pool.submit(run_timed, timings, func, *args)
+
+    def _result(self, future):
+        """(result, StageTimings or None) of a future from _submit"""
+        if self.timings is None:
+            return future.result(), None
+        return future.result()
+
+    def run(self, documents, cancel=None):
+        """
+        documents: iterable of (name, file_bytes or file_path), consumed lazily
+        Yields (index, record) in completion order; record['error'] is set
+        for files that could not be read, record['analysis'] is None for
+        resumes too short to score
+        With collect_timings each analysis has a 'timings' block and
+        self.timings accumulates the whole batch (including shared stages)
+        Raises BrokenProcessPool when a worker process dies (documents still
+        in flight get no record)
+        cancel: threading.Event; once set the run returns within
+        CANCEL_POLL_SECONDS, like closing the generator early: queued
+        documents are dropped and the ones already in a worker are abandoned
+        """
+        documents = iter(documents)
+        own_pool = self.pool is None
+        cpu_pool = worker_pool(self.workers) if own_pool else self.pool
+        embed_pool = ThreadPoolExecutor(max_workers=1)
+        timeout = None if cancel is None else CANCEL_POLL_SECONDS
+        pending = {}
+
+        try:
+            names = {}           # index -> name for documents still in flight
+            waiting = []         # prepared (index, record) awaiting embedding
+            embedding = None     # in-flight embed future
+            exhausted = False
+            submitted = 0
+
+            while True:
+                # Keep the CPU stages fed without reading the whole input
+                while not exhausted and len(names) < self.max_in_flight:
+                    try:
+                        name, data = next(documents)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    index = submitted
+                    submitted += 1
+                    names[index] = name
+                    pending[self._submit(cpu_pool, StageTimings(), parse_document, name, data)] = ('parse', index)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if cancel is not None and cancel.is_set():
+                    return
+
+                for future in done:
+                    kind, payload = pending.pop(future)
+                    if kind == 'embed':
+                        embedding = None
+                        indices = payload
+                        try:
+                            records, timings = self._result(future)
+                        except Exception as e:
+                            records = [self._failed(names[i], f"Error analyzing resume: {e}", retryable=True)
+                                       for i in indices]
+                        else:
+                            if timings is not None:
+                                self.timings.merge(timings)
+                                for record in records:
+                                    self.timings.merge(record['analysis']['timings'])
+                        for index, record in zip(indices, records):
+                            del names[index]
+                            yield index, record
+                        continue
+
+                    index = payload
+                    name = names[index]
+                    try:
+                        result, timings = self._result(future)
+                    except BrokenExecutor:
+                        raise   # a worker died: every document in flight is lost, not just this one
+                    except Exception as e:
+                        del names[index]
+                        yield index, self._failed(name, f"Error processing file: {e}", retryable=True)
+                        continue
+
+                    if kind == 'parse':
+                        document, error = result
+                        if error:
+                            if timings is not None:
+                                self.timings.merge(timings)
+                            del names[index]
+                            yield index, self._failed(name, error)
+                        else:
+                            nxt = self._submit(cpu_pool, timings, prepare_resume, name, document, self.profile)
+                            pending[nxt] = ('prepare', index)
+                    elif result['features'] is None:
+                        if timings is not None:
+                            self.timings.merge(timings)
+                        del names[index]
+                        yield index, result
+                    else:
+                        if timings is not None:
+                            result['timings'] = timings
+                        waiting.append((index, result))
+
+                # Hand the next batch to the embedder as soon as it is free;
+                # while it is busy, prepared resumes pile up into larger batches
+                if waiting and embedding is None:
+                    batch, waiting = waiting[:self.batch_size], waiting[self.batch_size:]
+                    embedding = self._submit(
+                        embed_pool, StageTimings(), embed_and_score,
+                        self.profile, [r for _, r in batch], self.batch_size
+                    )
+                    pending[embedding] = ('embed', [i for i, _ in batch])
+        finally:
+            # Cancelled or abandoned: drop queued work without waiting for it
+            abandoned = bool(pending)
+            for future in pending:
+                future.cancel()
+            if own_pool:
+                cpu_pool.shutdown(wait=not abandoned, cancel_futures=True)
+            embed_pool.shutdown(wait=not abandoned, cancel_futures=True)
+
+    @staticmethod
+    def _failed(name, error, retryable=False):
+        """Error record; retryable: the failure came from the run, not the file"""
+        return {'file_name': name, 'analysis': None, 'error': error, 'retryable': retryable}
@@ -0,0 +1,99 @@
+"""
+Stage Profiling
+Opt-in wall time, call counts and text sizes for the matching stages
+
+  timings = StageTimings()
+  with timings.activate():
+      matcher.analyze_resume(profile, text)   # stages record into timings
+  timings.as_dict()
+
+Stages nest: a stage entered inside another is recorded under a
+'/'-joined path (e.g. 'job_profile/or_groups'), times are inclusive.
+When no StageTimings is active, stage() does nothing.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_active = ContextVar('promatch_stage_timings', default=None)
+
+
+class StageTimings:
+    """Accumulated per-stage counters; picklable so workers can return them"""
+
+    def __init__(self):
+        self.stages = {}  # path -> [seconds, calls, chars]
+        self._path = []
+
+    @contextmanager
+    def activate(self):
+        """Record stages entered in this context (thread / task) into self"""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    def record(self, name, seconds, chars=0, calls=1):
+        entry = self.stages.get(name)
+        if entry is None:
+            self.stages[name] = [seconds, calls, chars]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+            entry[2] += chars
+
+    def merge(self, other):
+        """Add another StageTimings (or its as_dict() block) into this one"""
+        if isinstance(other, StageTimings):
+            items = ((name, *entry) for name, entry in other.stages.items())
+        else:
+            items = ((name, s['ms'] / 1000, s['calls'], s['chars'])
+                     for name, s in other.get('stages', {}).items())
+        for name, seconds, calls, chars in items:
+            self.record(name, seconds, chars, calls)
+        return self
+
+    def as_dict(self):
+        """JSON-friendly block: {'total_ms', 'stages': {path: {'ms', 'calls', 'chars'}}}"""
+        stages = {
+            name: {'ms': round(seconds * 1000, 3), 'calls': calls, 'chars': chars}
+            for name, (seconds, calls, chars) in self.stages.items()
+        }
+        total = sum(seconds for name, (seconds, _, _) in self.stages.items() if '/' not in name)
+        return {'total_ms': round(total * 1000, 3), 'stages': stages}
+
+    def __getstate__(self):
+        return {'stages': self.stages}
+
+    def __setstate__(self, state):
+        self.stages = state['stages']
+        self._path = []
+
+
+@contextmanager
+def stage(name, chars=0):
+    """Time a block as stage `name` if a StageTimings is active"""
+    timings = _active.get()
+    if timings is None:
+        yield
+        return
+
+    timings._path.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        path = '/'.join(timings._path)
+        timings._path.pop()
+        timings.record(path, elapsed, chars)
+
+
+def aggregate_timings(blocks):
+    """Sum timings blocks (e.g. result['timings'] of a batch) into one StageTimings"""
+    total = StageTimings()
+    for block in blocks:
+        if block:
+            total.merge(block)
+    return total
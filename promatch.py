@@ -0,0 +1,309 @@
+"""
+ProMatch Command Line
+Headless batch scoring for scheduled re-screening jobs
+
+  python promatch.py score --jd job.txt resumes/ "archive/**/*.pdf" \\
+      --workers 8 --format jsonl --output results.jsonl --checkpoint run.ckpt
+
+Results stream as they finish. With --checkpoint an interrupted run can be
+re-started with the same arguments and continues where it stopped.
+
+  python promatch.py ingest resumes/ --pool pool/ [--append]
+  python promatch.py index --pool pool/
+  python promatch.py rank --jd job.txt --pool pool/ --top 100 --format csv \\
+      [--min-must-have 4] [--prefilter 5000]
+
+ingest parses, extracts and embeds resumes once into a candidate pool;
+rank scores a job description against the whole pool without the files.
+For very large pools, --min-must-have skips candidates short of the JD's
+must-haves (skill index kept up to date by ingest), index builds a
+nearest-neighbour index and --prefilter limits full scoring to the
+semantically closest candidates.
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+CSV_FIELDS = [
+    'file', 'overall_score', 'must_have_score', 'nice_to_have_score',
+    'semantic_score', 'experience_bonus', 'must_have_matched',
+    'must_have_missing', 'nice_to_have_matched', 'email', 'phone',
+    'total_experience', 'education', 'completeness_score',
+    'certifications_count', 'error',
+]
+
+
+def collect_resumes(sources):
+    """Expand directories (recursively) and glob patterns into sorted file paths"""
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in files:
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        paths.add(os.path.join(root, name))
+        elif os.path.isfile(source):
+            paths.add(source)
+        else:
+            for path in glob.glob(source, recursive=True):
+                if os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+                    paths.add(path)
+    return sorted(paths)
+
+
+def load_checkpoint(path):
+    """Paths already written by an earlier run"""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def to_row(path, record):
+    """Flatten a pipeline record into one output row"""
+    analysis = record.get('analysis') or {}
+    breakdown = analysis.get('breakdown', {})
+    emails = record.get('emails') or []
+    phones = record.get('phones') or []
+    completeness = record.get('completeness') or {}
+
+    error = record.get('error')
+    if error is None and not analysis:
+        error = "Resume too short for analysis"
+
+    return {
+        'file': path,
+        'overall_score': analysis.get('overall_score'),
+        'must_have_score': breakdown.get('must_have_skills'),
+        'nice_to_have_score': breakdown.get('nice_to_have_skills'),
+        'semantic_score': breakdown.get('semantic_match'),
+        'experience_bonus': breakdown.get('experience_bonus'),
+        'must_have_matched': analysis.get('must_have_matched', []),
+        'must_have_missing': analysis.get('must_have_missing', []),
+        'nice_to_have_matched': analysis.get('nice_to_have_matched', []),
+        'email': emails[0] if emails else None,
+        'phone': phones[0] if phones else None,
+        'total_experience': record.get('total_exp'),
+        'education': record.get('education'),
+        'completeness_score': completeness.get('score'),
+        'certifications_count': len(record.get('certs') or []),
+        'error': error,
+    }
+
+
+class ResultWriter:
+    """Streams rows as JSONL or CSV, appending when a run is resumed"""
+
+    def __init__(self, output, fmt, append):
+        if output in (None, '-'):
+            self.stream = sys.stdout
+            self.owned = False
+            fresh = not append
+        else:
+            fresh = not (append and os.path.exists(output) and os.path.getsize(output) > 0)
+            self.stream = open(output, 'w' if fresh else 'a', encoding='utf-8', newline='')
+            self.owned = True
+
+        self.fmt = fmt
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(self.stream, fieldnames=CSV_FIELDS)
+            if fresh:
+                self.csv.writeheader()
+
+    def write(self, row):
+        if self.fmt == 'csv':
+            flat = {k: '; '.join(v) if isinstance(v, list) else v for k, v in row.items()}
+            self.csv.writerow(flat)
+        else:
+            self.stream.write(json.dumps(row, default=str) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+
+
+def read_job_description(path):
+    from utils import extract_text_from_file, normalize_text
+
+    text, error = extract_text_from_file(path)
+    if error:
+        raise SystemExit(f"promatch: cannot read job description {path}: {error}")
+    return normalize_text(text, preserve_structure=True)
+
+
+def cmd_score(args):
+    from concurrent.futures.process import BrokenProcessPool
+    from pipeline import ResumePipeline
+
+    paths = collect_resumes(args.resumes)
+    done = load_checkpoint(args.checkpoint)
+    todo = [p for p in paths if p not in done]
+
+    print(f"promatch: {len(paths)} resume(s), {len(paths) - len(todo)} already done, "
+          f"{len(todo)} to score", file=sys.stderr)
+
+    pipeline = ResumePipeline(read_job_description(args.jd), workers=args.workers,
+                              batch_size=args.batch_size)
+    writer = ResultWriter(args.output, args.format, append=bool(done))
+    checkpoint = open(args.checkpoint, 'a', encoding='utf-8') if args.checkpoint else None
+
+    scored = 0
+    try:
+        for _, record in pipeline.run((path, path) for path in todo):
+            if record.get('retryable') and checkpoint:
+                # Not the file's fault: leave it for the resumed run
+                print(f"promatch: {record['file_name']}: {record['error']} (retried on resume)", file=sys.stderr)
+                continue
+            writer.write(to_row(record['file_name'], record))
+            if checkpoint:
+                checkpoint.write(record['file_name'] + '\n')
+                checkpoint.flush()
+            scored += 1
+            if scored % 100 == 0:
+                print(f"promatch: {scored}/{len(todo)}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print(f"promatch: interrupted after {scored}/{len(todo)}"
+              + ("; re-run with the same --checkpoint to continue" if checkpoint else ""),
+              file=sys.stderr)
+        return 130
+    except BrokenProcessPool:
+        print(f"promatch: a worker process died after {scored}/{len(todo)}"
+              + ("; re-run with the same --checkpoint to retry the rest" if checkpoint else ""),
+              file=sys.stderr)
+        return 1
+    finally:
+        writer.close()
+        if checkpoint:
+            checkpoint.close()
+
+    print(f"promatch: done, {scored} resume(s) scored", file=sys.stderr)
+    return 0
+
+
+def cmd_ingest(args):
+    from candidate_pool import ingest
+
+    paths = collect_resumes(args.resumes)
+    print(f"promatch: ingesting {len(paths)} resume(s) into {args.pool}", file=sys.stderr)
+
+    stored = rejected = 0
+    try:
+        for name, error in ingest(args.pool, ((path, path) for path in paths), workers=args.workers,
+                                  append=args.append, batch_size=args.batch_size):
+            if error:
+                rejected += 1
+                print(f"promatch: skipped {name}: {error}", file=sys.stderr)
+                continue
+            stored += 1
+            if stored % 100 == 0:
+                print(f"promatch: {stored} stored", file=sys.stderr)
+    except ValueError as e:
+        raise SystemExit(f"promatch: {e}")
+    except KeyboardInterrupt:
+        print(f"promatch: interrupted after {stored} stored; re-run with --append to continue",
+              file=sys.stderr)
+        return 130
+
+    print(f"promatch: done, {stored} stored, {rejected} skipped", file=sys.stderr)
+    return 0
+
+
+def cmd_index(args):
+    from candidate_pool import CandidatePool, PoolWriter, PoolBusyError
+
+    try:
+        pool = CandidatePool(args.pool)
+        # Opening a writer brings the skill index up to date (pools from older versions)
+        PoolWriter(args.pool, append=True).close()
+    except PoolBusyError:
+        print(f"promatch: {args.pool} is being ingested; its skill index is kept up to date by the ingest",
+              file=sys.stderr)
+    except ValueError as e:
+        raise SystemExit(f"promatch: {e}")
+
+    start = time.perf_counter()
+    index = pool.build_index(lists=args.lists)
+    if index is None:
+        print(f"promatch: {args.pool} is empty, nothing to index", file=sys.stderr)
+        return 0
+    print(f"promatch: indexed {len(index)} candidate(s) in {index.lists} lists "
+          f"({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+    return 0
+
+
+def cmd_rank(args):
+    from candidate_pool import CandidatePool
+
+    try:
+        pool = CandidatePool(args.pool)
+    except ValueError as e:
+        raise SystemExit(f"promatch: {e}")
+    print(f"promatch: ranking {len(pool)} candidate(s) from {args.pool}", file=sys.stderr)
+
+    writer = ResultWriter(args.output, args.format, append=False)
+    try:
+        for record in pool.rank(read_job_description(args.jd), top=args.top, prefilter=args.prefilter,
+                                nprobe=args.nprobe, min_must_have=args.min_must_have):
+            writer.write(to_row(record['file_name'], record))
+    finally:
+        writer.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='promatch', description="ProMatch batch resume scoring")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help="score resumes against a job description")
+    score.add_argument('resumes', nargs='+', help="resume files, directories or glob patterns")
+    score.add_argument('--jd', required=True, help="job description file (.txt, .pdf, .docx)")
+    score.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    score.add_argument('--batch-size', type=int, default=32, help="resumes per embedding batch")
+    score.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    score.add_argument('--output', '-o', default='-', help="output file (default: stdout)")
+    score.add_argument('--checkpoint', help="progress file; re-run with it to resume")
+    score.set_defaults(func=cmd_score)
+
+    ingest = commands.add_parser('ingest', help="build or extend a candidate pool from resumes")
+    ingest.add_argument('resumes', nargs='+', help="resume files, directories or glob patterns")
+    ingest.add_argument('--pool', required=True, help="candidate pool directory")
+    ingest.add_argument('--append', action='store_true', help="keep existing rows, skip files already stored")
+    ingest.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    ingest.add_argument('--batch-size', type=int, default=32, help="resumes per embedding batch")
+    ingest.set_defaults(func=cmd_ingest)
+
+    index = commands.add_parser('index', help="build the nearest-neighbour and skill indexes of a candidate pool")
+    index.add_argument('--pool', required=True, help="candidate pool directory")
+    index.add_argument('--lists', type=int, default=None, help="index clusters (default: about 4 * sqrt(pool size))")
+    index.set_defaults(func=cmd_index)
+
+    rank = commands.add_parser('rank', help="rank a candidate pool against a job description")
+    rank.add_argument('--jd', required=True, help="job description file (.txt, .pdf, .docx)")
+    rank.add_argument('--pool', required=True, help="candidate pool directory")
+    rank.add_argument('--top', type=int, default=50, help="candidates to report (default: 50)")
+    rank.add_argument('--prefilter', type=int, default=None,
+                      help="fully score only the N semantically closest candidates (uses the index)")
+    rank.add_argument('--nprobe', type=int, default=None, help="index lists scanned per query (recall vs speed)")
+    rank.add_argument('--min-must-have', type=int, default=None,
+                      help="fully score only candidates meeting at least K must-haves (an OR group counts once)")
+    rank.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    rank.add_argument('--output', '-o', default='-', help="output file (default: stdout)")
+    rank.set_defaults(func=cmd_rank)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Score Combination
+The overall score is a weighted sum of per-candidate components
+
+Components are kept with every analysis result (result['components']),
+so a new weighting only re-runs combine_scores() and re-sorts; no
+parsing, extraction or embedding is repeated.
+"""
+import numpy as np
+from config import SCORING_WEIGHTS
+
+SCORE_COMPONENTS = tuple(SCORING_WEIGHTS)
+
+
+def combine_scores(components, weights=None):
+    """
+    Weighted sum of component scores (floats or NumPy arrays)
+    weights: {component: weight}; missing components use SCORING_WEIGHTS
+    """
+    weights = SCORING_WEIGHTS if weights is None else {**SCORING_WEIGHTS, **weights}
+    return (
+        components['must_have'] * weights['must_have'] +
+        components['semantic'] * weights['semantic'] +
+        components['nice_to_have'] * weights['nice_to_have'] +
+        components['experience'] * weights['experience'] +
+        components['coverage'] * weights['coverage']
+    )
+
+
+def overall_score(components, weights=None):
+    """Displayed overall score: combined, capped at 100, 2 decimals"""
+    return round(min(combine_scores(components, weights), 100), 2)
+
+
+class FeatureTable:
+    """
+    Component scores of many analysis results as columns
+    Re-ranking under new weights is one vectorized weighted sum
+    """
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.columns = {
+            name: np.array([r.get('components', {}).get(name, 0.0) for r in self.results], dtype=np.float64)
+            for name in SCORE_COMPONENTS
+        }
+
+    def __len__(self):
+        return len(self.results)
+
+    def scores(self, weights=None):
+        """Overall score of every row under weights (same rounding as analyze_resume)"""
+        combined = combine_scores(self.columns, weights)
+        return np.array([round(min(x, 100), 2) for x in combined.tolist()])
+
+    def rank(self, weights=None):
+        """(row order best-first, scores); ties keep input order"""
+        scores = self.scores(weights)
+        return np.argsort(-scores, kind='stable'), scores
@@ -0,0 +1,100 @@
+"""
+Resume Section Index
+One pass over a resume finds its section headers and the section
+keywords the completeness check looks for
+
+Sections are (start, end) offsets into the text, not copied strings;
+semantic scoring, completeness and education detection all read the
+same SectionIndex, built once per resume.
+"""
+import re
+
+# Header keywords; a line that matches several takes the first section listed
+SECTION_HEADERS = {
+    'experience': r'(?:work\s+)?experience|employment\s+history|professional\s+experience',
+    'education': r'education|academic\s+background|qualifications',
+    'skills': r'(?:technical\s+)?skills|competencies|expertise',
+    'projects': r'projects|portfolio',
+}
+
+# Lines this long or longer (stripped) are content, never headers
+MAX_HEADER_CHARS = 50
+
+# Keywords anywhere in the text that show a section is present
+SECTION_KEYWORDS = {
+    'contact': r'@|\+?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}|linkedin|github',
+    'experience': r'experience|employment|work history|professional background',
+    'education': r'education|degree|university|college|academic',
+    'skills': r'skills|technologies|competencies|technical skills|expertise',
+    'summary': r'summary|objective|about|profile|professional summary',
+}
+
+_HEADERS = [(name, re.compile(pattern)) for name, pattern in SECTION_HEADERS.items()]
+_ANY_HEADER = re.compile('|'.join(SECTION_HEADERS.values()))
+# Zero-width: every keyword start is seen, overlapping keywords included
+_KEYWORDS = re.compile('|'.join(f'(?=(?P<{name}>{pattern}))' for name, pattern in SECTION_KEYWORDS.items()))
+
+
+class SectionIndex:
+    """
+    Section offsets of one resume text
+    spans:    {section: (start, end)} body of each section, in first-header
+              order (a repeated header restarts its section)
+    headers:  {section: offset of its header line}
+    keywords: SECTION_KEYWORDS groups found anywhere in the text
+    """
+
+    def __init__(self, spans, headers, keywords):
+        self.spans = spans
+        self.headers = headers
+        self.keywords = keywords
+
+    def text(self, resume_text, name, with_header=False):
+        """Section body (optionally from its header line), '' if absent"""
+        if name not in self.spans:
+            return ""
+        start, end = self.spans[name]
+        if with_header:
+            start = self.headers[name]
+        # Every body line ends with a newline, the last one included
+        return (resume_text + "\n")[start:end]
+
+    def lengths(self):
+        """{section: body length} without slicing the text"""
+        return {name: end - start for name, (start, end) in self.spans.items()}
+
+
+def segment_sections(resume_text):
+    """SectionIndex of a (normalized) resume in a single pass"""
+    spans = {}
+    headers = {}
+    current = None
+    body_start = 0
+
+    pos = 0
+    for line in resume_text.split('\n'):
+        stripped = line.lower().strip()
+        name = None
+        if len(stripped) < MAX_HEADER_CHARS and _ANY_HEADER.search(stripped):
+            name = next(n for n, pattern in _HEADERS if pattern.search(stripped))
+        if name is not None:
+            if current is not None:
+                spans[current] = (body_start, pos)
+            current = name
+            headers[name] = pos
+            body_start = pos + len(line) + 1
+        pos += len(line) + 1
+
+    if current is not None:
+        spans[current] = (body_start, pos)
+
+    return SectionIndex(spans, headers, _find_keywords(resume_text.lower()))
+
+
+def _find_keywords(text_lower):
+    found = set()
+    for match in _KEYWORDS.finditer(text_lower):
+        found.add(match.lastgroup)
+        if len(found) == len(SECTION_KEYWORDS):
+            break
+    return found
@@ -0,0 +1,116 @@
+"""
+Skill Relationship Graph
+Implication, equivalence and related/broader edges compiled once
+
+Skills are SkillVocabulary IDs; each relation is a packed adjacency
+bitset matrix (one row per skill). Scoring a requirement against a
+candidate is a row AND candidate-bitset, and a whole requirement list
+is scored for a whole batch of candidates in one vectorized pass.
+"""
+import numpy as np
+from config import EQUIVALENT_TOOLS, RELATED_SKILLS
+
+# Partial credit per relation (checked in this order after an exact match)
+EXACT_CREDIT = 1.0
+EQUIVALENT_CREDIT = 0.95   # candidate has an interchangeable tool
+RELATED_CREDIT = 0.7       # candidate has a specific skill of a broad requirement
+BROADER_CREDIT = 0.8       # candidate has the broad skill of a specific requirement
+
+_CREDITS = np.array([EXACT_CREDIT, EQUIVALENT_CREDIT, RELATED_CREDIT, BROADER_CREDIT])
+
+
+class SkillGraph:
+    """
+    Compiled skill relationships over a SkillVocabulary
+    implies:     {skill: [implied capabilities]}
+    equivalents: {skill: [interchangeable skills]}
+    related:     {broad skill: [specific skills]}
+    """
+
+    def __init__(self, vocabulary, implies, equivalents=None, related=None):
+        equivalents = EQUIVALENT_TOOLS if equivalents is None else equivalents
+        related = RELATED_SKILLS if related is None else related
+        self.vocabulary = vocabulary
+        ids = vocabulary.ids
+        size = len(vocabulary)
+
+        # Implied capabilities keep their listed order (expansion is order-stable)
+        self.implied = {ids[skill]: [ids[t] for t in targets] for skill, targets in implies.items()}
+        # Skills that imply something -> implied row, for batch expansion
+        self.implication_sources = np.array(list(self.implied), dtype=np.int64)
+        self.implication = np.zeros((len(self.implied), size), dtype=np.float32)
+        for row, targets in enumerate(self.implied.values()):
+            self.implication[row, targets] = 1.0
+        # Implied capability -> skills implying it (reverse edges, for index lookups)
+        self.implied_by = {}
+        for source, targets in self.implied.items():
+            for target in targets:
+                self.implied_by.setdefault(target, []).append(source)
+
+        equivalent = np.zeros((size, size), dtype=bool)
+        specific = np.zeros((size, size), dtype=bool)   # broad -> its specific skills
+        broader = np.zeros((size, size), dtype=bool)    # specific -> its broad skills
+        for skill, targets in equivalents.items():
+            for target in targets:
+                equivalent[ids[skill], ids[target]] = True
+        for broad, targets in related.items():
+            for target in targets:
+                specific[ids[broad], ids[target]] = True
+                broader[ids[target], ids[broad]] = True
+
+        # (relation, skill, packed row) in credit order after the exact match
+        self.relations = np.packbits(np.stack([equivalent, specific, broader]), axis=2)
+
+    def expand(self, skills):
+        """Skills plus everything they imply"""
+        names, ids = self.vocabulary.names, self.vocabulary.ids
+        expanded = set(skills)
+        for skill in skills:
+            implied = self.implied.get(ids.get(skill))
+            if implied:
+                expanded.update(names[i] for i in implied)
+        return expanded
+
+    def sources(self, skill_id):
+        """Skill IDs whose presence puts skill_id in an expanded skill set"""
+        if skill_id < 0:
+            return []
+        return [skill_id] + self.implied_by.get(skill_id, [])
+
+    def expand_matrix(self, matrix):
+        """Boolean skill matrix plus implied skills, for a whole batch at once"""
+        if not len(self.implication_sources):
+            return matrix.copy()
+        implied = matrix[:, self.implication_sources].astype(np.float32) @ self.implication
+        return matrix | (implied > 0)
+
+    def similarity_matrix(self, required_ids, matrix):
+        """
+        Credit for each required skill ID (-1 = unknown) and each row of a
+        boolean skill matrix, shape (rows, requirements)
+        exact 1.0 > equivalent tool 0.95 > related specific skill 0.7 >
+        broader skill 0.8 > nothing 0.0 (first relation that holds wins)
+        """
+        required_ids = np.asarray(required_ids, dtype=np.int64)
+        known = required_ids >= 0
+        rows = np.where(known, required_ids, 0)
+
+        hits = np.empty((4, len(matrix), len(required_ids)), dtype=bool)
+        hits[0] = matrix[:, rows] & known
+        bits = np.packbits(matrix, axis=1)
+        hits[1:] = (self.relations[:, None, rows] & bits[None, :, None, :]).any(axis=3) & known
+
+        # First relation that holds decides the credit
+        return np.where(hits.any(axis=0), _CREDITS[hits.argmax(axis=0)], 0.0)
+
+    def similarity(self, required, candidate_skills):
+        """Credit for each required skill name given a candidate's skill names"""
+        required = list(required)
+        credit = self.similarity_matrix(
+            self.vocabulary.id_array(required), self.vocabulary.matrix([candidate_skills])
+        )[0]
+        # Names outside the vocabulary can still match exactly
+        for idx, skill in enumerate(required):
+            if skill not in self.vocabulary and skill in candidate_skills:
+                credit[idx] = EXACT_CREDIT
+        return credit
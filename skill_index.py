@@ -0,0 +1,305 @@
+"""
+Skill Index
+Inverted index from skill to the candidate pool rows that list it
+
+Posting lists hold ascending row ids as delta-encoded varints (7 bits per
+byte, high bit set on all but the last byte of a value): most gaps fit in
+one byte, so a skill held by a tenth of a 500k-row pool takes about 50 KB
+instead of 400 KB of int64 rows.
+
+Appends add one block per skill present in the appended rows; compact()
+merges each skill's blocks into one. Files of generation g (bumped by
+compact and reset, so a rewrite never touches files a reader has open):
+- postings.{g}.bin:    varint gaps of every block
+- postings.{g}.blocks: int64 (skill, first row, rows, byte offset) per block
+- postings.json:       generation, rows covered, blocks and bytes written
+postings.json is replaced last, like the pool's meta.json.
+"""
+import glob
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Block table columns
+_SKILL, _FIRST, _ROWS, _OFFSET = range(4)
+
+# compact() once the blocks outnumber the indexed skills this many times
+COMPACT_BLOCKS_PER_SKILL = 8
+
+
+def varint_lengths(values):
+    """Encoded bytes of each non-negative int64"""
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = np.asarray(values, dtype=np.int64) >> 7
+    while rest.any():
+        lengths += rest > 0
+        rest >>= 7
+    return lengths
+
+
+def encode_varints(values):
+    """Non-negative int64 values as one uint8 array of varints"""
+    values = np.asarray(values, dtype=np.int64)
+    lengths = varint_lengths(values)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    encoded = np.empty(int(ends[-1]) if len(values) else 0, dtype=np.uint8)
+    for position in range(int(lengths.max()) if len(values) else 0):
+        has = lengths > position
+        low = (values[has] >> (7 * position)) & 0x7f
+        more = (lengths[has] > position + 1).astype(np.int64) << 7
+        encoded[starts[has] + position] = low | more
+    return encoded
+
+
+def decode_varints(data):
+    """int64 values of a uint8 array of whole varints"""
+    data = np.asarray(data, dtype=np.uint8)
+    more = data >= 0x80
+    if not more.any():
+        return data.astype(np.int64)    # every value fits in one byte (small gaps)
+    ends = np.flatnonzero(~more) + 1
+    starts = np.concatenate([[0], ends[:-1]])
+    position = np.arange(len(data)) - np.repeat(starts, ends - starts)
+    parts = (data & 0x7f).astype(np.int64) << (7 * position)
+    return np.bitwise_or.reduceat(parts, starts)
+
+
+def encode_blocks(skills, rows):
+    """
+    (block table, payload) for (skill, row) pairs sorted by skill, then row
+    Block offsets are relative to the payload
+    """
+    skills = np.asarray(skills, dtype=np.int64)
+    rows = np.asarray(rows, dtype=np.int64)
+    if not len(skills):
+        return np.zeros((0, 4), dtype=np.int64), np.zeros(0, dtype=np.uint8)
+    head = np.ones(len(skills), dtype=bool)
+    head[1:] = skills[1:] != skills[:-1]
+    heads = np.flatnonzero(head)
+
+    # Every row after a block's first is stored as its gap to the previous row
+    gaps = np.diff(rows)[~head[1:]]
+    gap_blocks = (np.cumsum(head) - 1)[~head]
+    sizes = np.bincount(gap_blocks, weights=varint_lengths(gaps), minlength=len(heads)).astype(np.int64)
+
+    table = np.empty((len(heads), 4), dtype=np.int64)
+    table[:, _SKILL] = skills[heads]
+    table[:, _FIRST] = rows[heads]
+    table[:, _ROWS] = np.diff(np.append(heads, len(skills)))
+    table[:, _OFFSET] = np.cumsum(sizes) - sizes
+    return table, encode_varints(gaps)
+
+
+def decode_blocks(table, payload, ends):
+    """Ascending rows of consecutive-row blocks (same skill, ordered by first row)"""
+    if not len(table):
+        return np.zeros(0, dtype=np.int64)
+    if len(table) == 1:
+        # Compacted list: the first row, then running gaps
+        rows = np.empty(table[0, _ROWS], dtype=np.int64)
+        rows[0] = table[0, _FIRST]
+        rows[1:] = decode_varints(payload[table[0, _OFFSET]:ends[0]])
+        return np.cumsum(rows, out=rows)
+    counts = table[:, _ROWS]
+    gaps = decode_varints(np.concatenate([payload[a:b] for a, b in zip(table[:, _OFFSET], ends)]))
+
+    # Running sum of the gaps, restarted at each block's first row
+    head = np.zeros(int(counts.sum()), dtype=bool)
+    heads = np.cumsum(counts) - counts
+    head[heads] = True
+    steps = np.zeros(len(head), dtype=np.int64)
+    steps[~head] = gaps
+    running = np.cumsum(steps)
+    return running - np.repeat(running[heads] - table[:, _FIRST], counts)
+
+
+def requirements_met(requirements, skill_matrix):
+    """Requirements met per row of a boolean skill matrix (same rule as SkillIndex)"""
+    met = np.zeros(len(skill_matrix), dtype=np.int64)
+    for ids in requirements:
+        if len(ids):
+            met += skill_matrix[:, np.asarray(ids, dtype=np.int64)].any(axis=1)
+    return met
+
+
+def must_have_requirements(profile, skill_graph):
+    """
+    Skill ID lists, one per requirement of a JobProfile: each must-have and
+    each OR group (any member), with every skill that implies a required one
+    A candidate meets a requirement when it lists any skill in its list,
+    the exact matches of match_skills(); partial credit does not count
+    """
+    requirements = [skill_graph.sources(int(skill_id)) for skill_id in profile.must_have_ids]
+    starts = list(profile.or_group_starts) + [len(profile.or_member_ids)]
+    for start, stop in zip(starts[:-1], starts[1:]):
+        members = profile.or_member_ids[start:stop]
+        requirements.append(sorted({s for skill_id in members for s in skill_graph.sources(int(skill_id))}))
+    return requirements
+
+
+class SkillIndex:
+    """
+    Read side of the posting lists of a pool directory
+    Covers pool rows [0, len(index)); later rows are only in skills.bits
+    """
+
+    def __init__(self, meta, table, payload):
+        self.meta = meta
+        self.table = table
+        self.payload = payload
+        # Blocks grouped by skill, in row order within a skill
+        self.order = np.lexsort((table[:, _FIRST], table[:, _SKILL]))
+        self.skills = table[self.order, _SKILL]
+        self.ends = np.append(table[1:, _OFFSET], meta['bytes'])
+
+    @classmethod
+    def load(cls, directory):
+        """Index of a pool directory, or None when none was written"""
+        meta = _read_meta(directory)
+        if meta is None:
+            return None
+        base = os.path.join(directory, f"postings.{meta['generation']}")
+        table = np.fromfile(f"{base}.blocks", dtype='<i8', count=meta['blocks'] * 4).reshape(-1, 4)
+        if meta['bytes']:
+            payload = np.memmap(f"{base}.bin", dtype=np.uint8, mode='r', shape=(meta['bytes'],))
+        else:
+            payload = np.zeros(0, dtype=np.uint8)
+        return cls(meta, table, payload)
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def rows(self, skill_id):
+        """Ascending rows listing a skill"""
+        lo, hi = np.searchsorted(self.skills, [skill_id, skill_id + 1])
+        blocks = self.order[lo:hi]
+        return decode_blocks(self.table[blocks], self.payload, self.ends[blocks])
+
+    def at_least(self, requirements, k):
+        """
+        Ascending rows meeting at least k requirements
+        requirements: skill ID lists, each met by any of its skills
+        """
+        met = np.zeros(len(self), dtype=np.int32)
+        for ids in requirements:
+            if len(ids) == 1:
+                met[self.rows(ids[0])] += 1
+            elif len(ids):
+                hit = np.zeros(len(self), dtype=bool)
+                for skill_id in ids:
+                    hit[self.rows(skill_id)] = True
+                met += hit
+        return np.flatnonzero(met >= k)
+
+
+class SkillIndexWriter:
+    """
+    Append side of the posting lists (driven by PoolWriter)
+    reset=True starts an empty index; otherwise anything written after
+    the last complete append is dropped
+    """
+
+    def __init__(self, directory, reset=False):
+        self.directory = directory
+        meta = None if reset else _read_meta(directory)
+        if meta is None:
+            previous = _read_meta(directory)
+            generation = previous['generation'] + 1 if previous else 0
+            meta = {'generation': generation, 'rows': 0, 'blocks': 0, 'bytes': 0}
+            self.meta = meta
+            self._truncate()
+            self._write_meta()
+            _remove_generations(directory, keep=generation)
+        else:
+            self.meta = meta
+            self._truncate()
+
+    def __len__(self):
+        return self.meta['rows']
+
+    def _path(self, suffix, generation=None):
+        generation = self.meta['generation'] if generation is None else generation
+        return os.path.join(self.directory, f"postings.{generation}.{suffix}")
+
+    def _truncate(self):
+        for suffix, size in (('bin', self.meta['bytes']), ('blocks', self.meta['blocks'] * 32)):
+            with open(self._path(suffix), 'ab') as f:
+                f.truncate(size)
+
+    def append(self, first_row, skill_matrix):
+        """Index rows first_row.. of a pool from their boolean skill matrix"""
+        if first_row != self.meta['rows']:
+            raise ValueError(f"skill index covers {self.meta['rows']} rows, cannot append row {first_row}")
+        skills, rows = np.nonzero(np.asarray(skill_matrix, dtype=bool).T)
+        table, payload = encode_blocks(skills, rows + first_row)
+        table[:, _OFFSET] += self.meta['bytes']
+
+        for suffix, data in (('bin', payload), ('blocks', table.astype('<i8'))):
+            with open(self._path(suffix), 'ab') as f:
+                f.write(data.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.meta['rows'] += len(skill_matrix)
+        self.meta['blocks'] += len(table)
+        self.meta['bytes'] += len(payload)
+        self._write_meta()
+
+    def needs_compaction(self):
+        """True once appends have split the posting lists into many blocks"""
+        blocks = self.meta['blocks']
+        return blocks > COMPACT_BLOCKS_PER_SKILL * max(1, self.meta.get('skills', 0))
+
+    def compact(self):
+        """Rewrite the index with one block per skill (new generation)"""
+        index = SkillIndex.load(self.directory)
+        skills = np.unique(index.skills).tolist()
+        generation = self.meta['generation'] + 1
+
+        blocks = []
+        size = 0
+        with open(self._path('bin', generation), 'wb') as f:
+            for skill_id in skills:
+                rows = index.rows(skill_id)
+                table, payload = encode_blocks(np.full(len(rows), skill_id), rows)
+                table[:, _OFFSET] += size
+                f.write(payload.tobytes())
+                blocks.append(table)
+                size += len(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        table = np.concatenate(blocks) if blocks else np.zeros((0, 4), dtype=np.int64)
+        table.astype('<i8').tofile(self._path('blocks', generation))
+        del index
+
+        self.meta = {'generation': generation, 'rows': self.meta['rows'], 'blocks': len(table),
+                     'bytes': size, 'skills': len(skills)}
+        self._write_meta()
+        _remove_generations(self.directory, keep=generation)
+
+    def _write_meta(self):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, os.path.join(self.directory, 'postings.json'))
+
+
+def _read_meta(directory):
+    try:
+        with open(os.path.join(directory, 'postings.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _remove_generations(directory, keep):
+    """Delete the files of every generation but `keep`"""
+    for path in glob.glob(os.path.join(directory, 'postings.*.*')):
+        generation = os.path.basename(path).split('.')[1]
+        if generation.isdigit() and int(generation) != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass    # still open elsewhere (Windows); removed by a later rewrite
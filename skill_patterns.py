@@ -0,0 +1,357 @@
+"""
+Compiled Skill Patterns
+Aho-Corasick multi-pattern matcher built once from config.py
+One linear pass finds the skills and aliases a text holds, instead of
+thousands of per-skill regex scans
+"""
+import heapq
+import re
+from bisect import bisect_right
+from config import SKILL_SYNONYMS
+
+# Zero-width matches of \b give the exact word-boundary positions the
+# original per-skill r'\b' + re.escape(skill) + r'\b' patterns relied on
+_WORD_BOUNDARY = re.compile(r'\b')
+_WORD_CHAR = re.compile(r'\w')
+
+
+class AhoCorasick:
+    """
+    Multi-pattern literal matcher
+    Reports every occurrence (including overlapping ones) in a single pass
+    """
+
+    def __init__(self, patterns, word_boundaries=True):
+        self.patterns = list(patterns)
+        self.lengths = [len(p) for p in self.patterns]
+        self.word_boundaries = word_boundaries
+
+        # Trie
+        self._goto = [{}]
+        self._out = [[]]
+        for pid, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(pid)
+
+        # Failure links (BFS), merging outputs along the suffix chain
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """
+        Return [(start, end, pattern_id), ...] for every occurrence
+        With word_boundaries=True both ends must sit on a regex \\b
+        """
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self.lengths
+        matches = []
+
+        if self.word_boundaries:
+            bounds = bytearray(len(text) + 1)
+            for m in _WORD_BOUNDARY.finditer(text):
+                bounds[m.start()] = 1
+        else:
+            bounds = None
+
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            if out[state]:
+                end = i + 1
+                if bounds is None:
+                    for pid in out[state]:
+                        matches.append((end - lengths[pid], end, pid))
+                elif bounds[end]:
+                    for pid in out[state]:
+                        start = end - lengths[pid]
+                        if bounds[start]:
+                            matches.append((start, end, pid))
+
+        return matches
+
+
+class SynonymPatterns:
+    """
+    Compiled view of SKILL_SYNONYMS
+    Every alias and every canonical skill is a pattern in one automaton
+    """
+
+    def __init__(self, synonyms=None):
+        synonyms = SKILL_SYNONYMS if synonyms is None else synonyms
+
+        patterns = list(synonyms.keys())
+        self.key_count = len(patterns)
+        self.canonical = [synonyms[k] for k in patterns]
+
+        # Canonical values that are not aliases themselves still need a pattern
+        pattern_ids = {p: i for i, p in enumerate(patterns)}
+        for value in synonyms.values():
+            if value not in pattern_ids:
+                pattern_ids[value] = len(patterns)
+                patterns.append(value)
+                self.canonical.append(value)
+
+        # Pattern ids that spell a canonical skill (direct matching)
+        self.value_of = {}
+        for value in set(synonyms.values()):
+            self.value_of[pattern_ids[value]] = value
+
+        # Longest alias first, ties in dict order (same as a stable sort by length)
+        order = sorted(range(self.key_count), key=lambda i: -len(patterns[i]))
+        self.key_rank = [0] * self.key_count
+        for rank, pid in enumerate(order):
+            self.key_rank[pid] = rank
+        self.key_order = order
+
+        # Aliases by their proper prefixes and suffixes (see _followers)
+        self.key_ids = {patterns[pid]: pid for pid in range(self.key_count)}
+        self.by_prefix = {}
+        self.by_suffix = {}
+        for pid in range(self.key_count):
+            alias = patterns[pid]
+            for k in range(1, len(alias)):
+                self.by_prefix.setdefault(alias[:k], []).append(pid)
+                self.by_suffix.setdefault(alias[-k:], []).append(pid)
+
+        self.patterns = patterns
+        self.automaton = AhoCorasick(patterns, word_boundaries=True)
+        self._regexes = {}
+        self._followers_of = {}
+
+    def occurrences(self, text):
+        """All word-bounded occurrences of aliases and canonical skills"""
+        return self.automaton.find_all(text)
+
+    def select_longest(self, occurrences, claims=None):
+        """
+        Longest-match-wins overlap resolution over alias occurrences
+        Aliases are visited longest first; each alias keeps its own
+        non-overlapping leftmost matches and a match is kept only if it
+        does not overlap a span already claimed.
+        claims(pid) decides whether a kept match blocks later ones
+        Returns kept (start, end, pid) in resolution order
+        """
+        key_count, key_rank = self.key_count, self.key_rank
+
+        by_key = sorted(
+            (key_rank[pid], start, end, pid)
+            for start, end, pid in occurrences if pid < key_count
+        )
+
+        if not by_key:
+            return []
+
+        claimed = bytearray(max(item[2] for item in by_key))
+        selected = []
+        last_pid, last_end = -1, 0
+
+        for _, start, end, pid in by_key:
+            # re.finditer never reports overlapping matches of one alias
+            if pid == last_pid and start < last_end:
+                continue
+            last_pid, last_end = pid, end
+
+            if claimed.find(1, start, end) != -1:
+                continue
+            if claims is None or claims(pid):
+                claimed[start:end] = b'\x01' * (end - start)
+                selected.append((start, end, pid))
+
+        return selected
+
+    def canonicalize(self, text, track_spans=True):
+        """
+        Replace every alias with its canonical skill
+        Same result as re.sub of each alias, longest first, over the text
+        rewritten so far (a replacement can complete a later, shorter alias),
+        but only the aliases found in the text up front (automaton) and
+        those a replacement can complete (_followers) are substituted
+        text must be lowercase, like the aliases (the old loop's IGNORECASE
+        made no difference then)
+        Returns (new_text, spans) where each span is
+        (src_start, src_end, dst_start, dst_end) for one replaced region,
+        spans is None with track_spans=False
+        """
+        key_count, key_rank = self.key_count, self.key_rank
+        queue = sorted({key_rank[pid] for _, _, pid in self.occurrences(text) if pid < key_count})
+        queued = set(queue)
+        spans = [] if track_spans else None
+
+        while queue:
+            rank = heapq.heappop(queue)
+            pid = self.key_order[rank]
+            value = self.canonical[pid]
+            edits = []
+
+            def substitute(match):
+                edits.append(match.span())
+                return value
+
+            text = self._regex(pid).sub(substitute, text)
+            if not edits:
+                continue
+            if track_spans:
+                spans = _replace_spans(spans, edits, len(value))
+
+            for follower in self._followers(pid):
+                if follower not in queued:
+                    queued.add(follower)
+                    heapq.heappush(queue, follower)
+
+        return text, spans
+
+    def _regex(self, pid):
+        """
+        r'\b' + alias + r'\b', with both boundaries checked after the literal
+        so re can search for the literal first (a leading \b makes it try
+        every position)
+        """
+        regex = self._regexes.get(pid)
+        if regex is None:
+            alias = re.escape(self.patterns[pid])
+            before = r'(?<!\w' if _WORD_CHAR.match(self.patterns[pid][0]) else r'(?<=\w'
+            after = r'(?!\w)' if _WORD_CHAR.match(self.patterns[pid][-1]) else r'(?=\w)'
+            regex = re.compile(alias + before + alias + ')' + after)
+            self._regexes[pid] = regex
+        return regex
+
+    def _followers(self, pid):
+        """
+        Ranks of the aliases after pid that can match inside or across its
+        inserted replacement; no other alias gains a match from it (a match
+        that only touches the insertion keeps the boundary the replaced
+        alias had)
+        Word boundaries inside the replacement are respected, the outer
+        text is unknown so any alias running past it counts
+        """
+        followers = self._followers_of.get(pid)
+        if followers is not None:
+            return followers
+
+        value = self.canonical[pid]
+        size = len(value)
+        bounds = {m.start() for m in _WORD_BOUNDARY.finditer(value)} | {0, size}
+        found = set()
+        for start in range(size):
+            if start not in bounds:
+                continue
+            # Inside the replacement, or starting in it and running past its end
+            for end in range(start + 1, size + 1):
+                if end in bounds and value[start:end] in self.key_ids:
+                    found.add(self.key_ids[value[start:end]])
+            found.update(self.by_prefix.get(value[start:], ()))
+        for end in range(1, size + 1):
+            # Starting before the replacement, ending in it or at its end
+            if end in bounds:
+                found.update(self.by_suffix.get(value[:end], ()))
+        # Spanning the whole replacement
+        found.update(
+            other for other in range(self.key_count)
+            if len(self.patterns[other]) > size + 1 and value in self.patterns[other][1:-1]
+        )
+
+        rank = self.key_rank[pid]
+        followers = [self.key_rank[other] for other in found if self.key_rank[other] > rank]
+        self._followers_of[pid] = followers
+        return followers
+
+
+def map_to_source(spans, offset):
+    """
+    Map an offset in canonicalized text back to the source text
+    Offsets inside a replaced alias map to the start of that alias
+    """
+    index = bisect_right([span[2] for span in spans], offset) - 1
+    if index < 0:
+        return offset
+    src_start, src_end, dst_start, dst_end = spans[index]
+    if offset < dst_end:
+        return src_start
+    return src_end + (offset - dst_end)
+
+
+def _replace_spans(spans, edits, length):
+    """
+    Spans after replacing the (start, end) edits of the current text with
+    `length` characters each; a replacement over earlier replaced text
+    merges with their spans, so spans always map to the source text
+    """
+    result = []
+    index = 0
+    shift = 0
+    region = None   # replaced region being built, in current-text offsets
+    region_shift = 0
+    for start, end in edits:
+        if region is not None and region[3] <= start:
+            result.append((region[0], region[1], region[2] + region_shift, region[3] + shift))
+            region = None
+        if region is None:
+            region = [map_to_source(spans, start), map_to_source(spans, end), start, end]
+            region_shift = shift
+        else:
+            region[1] = max(region[1], map_to_source(spans, end))
+            region[3] = max(region[3], end)
+
+        # Spans before the edit shift by the edits so far; overlapped ones merge
+        while index < len(spans) and spans[index][2] < end:
+            span = spans[index]
+            index += 1
+            if span[3] <= start:
+                result.append((span[0], span[1], span[2] + shift, span[3] + shift))
+            else:
+                region[0], region[1] = min(region[0], span[0]), max(region[1], span[1])
+                region[2], region[3] = min(region[2], span[2]), max(region[3], span[3])
+        shift += length - (end - start)
+
+    if region is not None:
+        result.append((region[0], region[1], region[2] + region_shift, region[3] + shift))
+    result.extend((span[0], span[1], span[2] + shift, span[3] + shift) for span in spans[index:])
+    return result
+
+
+def leftmost_longest(spans):
+    """
+    Non-overlapping (start, end, value) spans in text order
+    The leftmost span wins, the longest one among spans starting together
+    """
+    selected = []
+    last_end = 0
+    for span in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if span[0] >= last_end:
+            selected.append(span)
+            last_end = span[1]
+    return selected
+
+
+_synonym_patterns = None
+
+def get_synonym_patterns():
+    """Shared compiled patterns (built on first use)"""
+    global _synonym_patterns
+    if _synonym_patterns is None:
+        _synonym_patterns = SynonymPatterns()
+    return _synonym_patterns
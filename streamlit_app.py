@@ -6,15 +6,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from pdfminer.high_level import extract_text as pdf_extract_text
-import docx
 from datetime import datetime
-from utils import (
-    extract_emails, extract_phone_numbers,
-    extract_years_of_experience, extract_education_level,
-    calculate_resume_completeness, extract_certifications, normalize_text
-)
-from matcher import analyze_resume
+from utils import normalize_text
+from jobs import start_job, get_job
+from matcher import get_matcher, job_profile_key
+from models import get_sentence_model
+from skill_patterns import get_synonym_patterns
+from config import SCORING_WEIGHTS
+from scoring import FeatureTable
+
+# Resumes scored per embedding batch
+ANALYSIS_BATCH_SIZE = 32
 
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
@@ -24,6 +26,30 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# ==================== CACHED RESOURCES ====================
+# Shared by every session and rerun of this server process
+
+@st.cache_resource(show_spinner="Loading matching engine...")
+def load_matcher():
+    """Matcher with its compiled skill automaton, vocabulary and skill graph"""
+    get_synonym_patterns()
+    return get_matcher()
+
+
+@st.cache_resource(show_spinner="Loading embedding model...")
+def load_embedding_model():
+    """Sentence embedding model (loaded on the first analysis, not at startup)"""
+    return get_sentence_model()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_job_profile(jd_key, _clean_jd):
+    """Compiled JobProfile keyed by the normalized JD's SHA-256"""
+    return load_matcher().get_job_profile(_clean_jd)
+
+
+load_matcher()
+
 # ==================== CUSTOM CSS ====================
 st.markdown("""
     <style>
@@ -242,6 +268,15 @@ if 'results' not in st.session_state:
     st.session_state.results = []
 if 'jd_saved' not in st.session_state:
     st.session_state.jd_saved = None
+if 'timings' not in st.session_state:
+    st.session_state.timings = None
+if 'feature_table' not in st.session_state:
+    st.session_state.feature_table = None
+if 'job_id' not in st.session_state:
+    st.session_state.job_id = None          # background analysis in progress
+    st.session_state.job_collected = 0      # job records already copied into results
+    st.session_state.job_warnings = []
+    st.session_state.job_finished = None    # status of a job that just finished
 
 # ==================== HEADER ====================
 col1, col2 = st.columns([3, 1])
@@ -296,9 +331,25 @@ Example:
     if uploaded_files:
         st.success(f"✅ **{len(uploaded_files)}** resume(s) uploaded")
         for file in uploaded_files:
-            file_size = len(file.getvalue()) / 1024
+            file_size = file.size / 1024
             st.text(f"📄 {file.name} ({file_size:.1f} KB)")
     
+    collect_timings = st.checkbox(
+        "⏱️ Collect performance timings",
+        value=False,
+        help="Record time spent in each analysis stage (shown below the results)"
+    )
+    
+    # Scoring weights re-rank finished results without reprocessing files
+    with st.expander("⚖️ Scoring Weights"):
+        scoring_weights = {
+            'must_have': st.slider("Must-have skills", 0.0, 1.0, SCORING_WEIGHTS['must_have'], 0.05),
+            'semantic': st.slider("Semantic match", 0.0, 1.0, SCORING_WEIGHTS['semantic'], 0.05),
+            'nice_to_have': st.slider("Nice-to-have skills", 0.0, 1.0, SCORING_WEIGHTS['nice_to_have'], 0.05),
+            'experience': st.slider("Experience bonus", 0.0, 2.0, SCORING_WEIGHTS['experience'], 0.1),
+            'coverage': st.slider("Skill coverage", 0.0, 0.5, SCORING_WEIGHTS['coverage'], 0.05),
+        }
+    
     st.markdown("---")
     
     # Action Buttons
@@ -306,11 +357,18 @@ Example:
     with col1:
         analyze_btn = st.button("🚀 Analyze", type="primary", use_container_width=True)
     with col2:
-        if st.session_state.analysis_complete:
+        if st.session_state.analysis_complete or st.session_state.job_id:
             if st.button("🔄 Reset", use_container_width=True):
+                job = get_job(st.session_state.job_id)
+                if job is not None:
+                    job.cancel()
+                st.session_state.job_id = None
+                st.session_state.job_warnings = []
                 st.session_state.analysis_complete = False
                 st.session_state.results = []
                 st.session_state.jd_saved = None
+                st.session_state.timings = None
+                st.session_state.feature_table = None
                 st.rerun()
     
     # Info Box
@@ -327,6 +385,92 @@ Example:
 
 # ==================== MAIN CONTENT ====================
 
+def result_row(item):
+    """Dashboard row for one pipeline record"""
+    if item['analysis'] is None:
+        analysis = {
+            'overall_score': 0,
+            'breakdown': {
+                'must_have_skills': 0,
+                'nice_to_have_skills': 0,
+                'semantic_match': 0,
+                'experience_bonus': 0
+            },
+            'must_have_matched': [],
+            'must_have_missing': [],
+            'nice_to_have_matched': [],
+            'insights': ["⚠️ Resume too short for analysis"]
+        }
+    else:
+        analysis = item['analysis']
+    
+    emails = item['emails']
+    phones = item['phones']
+    total_exp = item['total_exp']
+    education = item['education']
+    
+    return {
+        'file_name': item['file_name'],
+        'email': emails[0] if emails else "Not found",
+        'phone': phones[0] if phones else "Not found",
+        'overall_score': analysis['overall_score'],
+        'must_have_score': analysis['breakdown']['must_have_skills'],
+        'nice_to_have_score': analysis['breakdown']['nice_to_have_skills'],
+        'semantic_score': analysis['breakdown']['semantic_match'],
+        'experience_bonus': analysis['breakdown']['experience_bonus'],
+        'must_have_matched': analysis['must_have_matched'],
+        'must_have_missing': analysis['must_have_missing'],
+        'nice_to_have_matched': analysis['nice_to_have_matched'],
+        'insights': analysis['insights'],
+        'total_experience': total_exp if total_exp is not None else "N/A",
+        'education': education if education else "Not specified",
+        'completeness_score': item['completeness']['score'],
+        'certifications_count': len(item['certs']),
+        'full_analysis': analysis
+    }
+
+
+def sync_job():
+    """Copy records the background job finished since the last rerun into session state"""
+    job = get_job(st.session_state.job_id)
+    if job is None:
+        st.session_state.job_id = None
+        return
+    
+    records = job.records(st.session_state.job_collected)
+    st.session_state.job_collected += len(records)
+    for _, item in records:
+        if item['error']:
+            st.session_state.job_warnings.append(f"{item['file_name']}: {item['error']}")
+        else:
+            st.session_state.results.append(result_row(item))
+    if records:
+        st.session_state.feature_table = FeatureTable(r['full_analysis'] for r in st.session_state.results)
+    
+    if job.finished and st.session_state.job_collected >= len(job.records()):
+        st.session_state.analysis_complete = True
+        st.session_state.timings = job.timings
+        st.session_state.job_finished = job.status
+        if job.error:
+            st.session_state.job_warnings.append(job.error)
+        st.session_state.job_id = None
+
+
+@st.fragment(run_every=2)
+def job_progress():
+    """Live progress of the background job; reloads the page as results arrive"""
+    job = get_job(st.session_state.job_id)
+    if job is None:
+        return
+    done, total = job.progress()
+    st.markdown("### 🔄 Processing Resumes...")
+    st.progress(done / max(total, 1), text=f"**Analyzed:** {done}/{total} — finished candidates are listed below")
+    if st.button("⏹️ Stop Analysis"):
+        job.cancel()
+    if done > st.session_state.job_collected or job.finished:
+        st.rerun()
+
+
 # ANALYSIS TRIGGER
 if analyze_btn:
     if not jd_input:
@@ -334,116 +478,56 @@ if analyze_btn:
     elif not uploaded_files:
         st.error("⚠️ Please upload at least one resume")
     else:
-        results = []
-        clean_jd = normalize_text(jd_input, preserve_structure=True)
+        previous = get_job(st.session_state.job_id)
+        if previous is not None:
+            previous.cancel()
         
-        # Progress Container
-        progress_container = st.container()
-        with progress_container:
-            st.markdown("### 🔄 Processing Resumes...")
-            progress_text = st.empty()
-            progress_bar = st.progress(0)
-        
-        # Process each resume
-        for idx, file in enumerate(uploaded_files):
-            progress_text.markdown(f"**Analyzing:** `{file.name}` ({idx + 1}/{len(uploaded_files)})")
-            
-            try:
-                file_extension = file.name.split('.')[-1].lower()
-                
-                # Extract raw text
-                if file_extension == 'pdf':
-                    raw_text = pdf_extract_text(file)
-                elif file_extension in ['docx', 'doc']:
-                    doc = docx.Document(file)
-                    text_parts = []
-                    for para in doc.paragraphs:
-                        if para.text.strip():
-                            text_parts.append(para.text)
-                    for table in doc.tables:
-                        for row in table.rows:
-                            for cell in row.cells:
-                                if cell.text.strip():
-                                    text_parts.append(cell.text)
-                    raw_text = "\n".join(text_parts)
-                elif file_extension == 'txt':
-                    content = file.read()
-                    raw_text = content.decode('utf-8', errors='ignore') if isinstance(content, bytes) else content
-                else:
-                    st.warning(f"⚠️ Unsupported format: {file.name}")
-                    continue
-                
-                if not raw_text or len(raw_text.strip()) < 50:
-                    st.warning(f"⚠️ File too short or empty: {file.name}")
-                    continue
-                
-                # Extract metadata
-                emails = extract_emails(raw_text)
-                phones = extract_phone_numbers(raw_text)
-                resume_text = normalize_text(raw_text, preserve_structure=True)
-                total_exp = extract_years_of_experience(resume_text)
-                education = extract_education_level(resume_text)
-                completeness = calculate_resume_completeness(resume_text)
-                certs = extract_certifications(resume_text)
-                
-                # Analyze
-                if len(resume_text) < 100:
-                    analysis = {
-                        'overall_score': 0,
-                        'breakdown': {
-                            'must_have_skills': 0,
-                            'nice_to_have_skills': 0,
-                            'semantic_match': 0,
-                            'experience_bonus': 0
-                        },
-                        'must_have_matched': [],
-                        'must_have_missing': [],
-                        'nice_to_have_matched': [],
-                        'insights': ["⚠️ Resume too short for analysis"]
-                    }
-                else:
-                    analysis = analyze_resume(clean_jd, resume_text)
-                
-                # Store results
-                results.append({
-                    'file_name': file.name,
-                    'email': emails[0] if emails else "Not found",
-                    'phone': phones[0] if phones else "Not found",
-                    'overall_score': analysis['overall_score'],
-                    'must_have_score': analysis['breakdown']['must_have_skills'],
-                    'nice_to_have_score': analysis['breakdown']['nice_to_have_skills'],
-                    'semantic_score': analysis['breakdown']['semantic_match'],
-                    'experience_bonus': analysis['breakdown']['experience_bonus'],
-                    'must_have_matched': analysis['must_have_matched'],
-                    'must_have_missing': analysis['must_have_missing'],
-                    'nice_to_have_matched': analysis['nice_to_have_matched'],
-                    'insights': analysis['insights'],
-                    'total_experience': total_exp if total_exp is not None else "N/A",
-                    'education': education if education else "Not specified",
-                    'completeness_score': completeness['score'],
-                    'certifications_count': len(certs),
-                    'full_analysis': analysis
-                })
-                
-            except Exception as e:
-                st.error(f"❌ Error processing {file.name}: {str(e)}")
-                continue
-            
-            progress_bar.progress((idx + 1) / len(uploaded_files))
-        
-        progress_text.empty()
-        progress_bar.empty()
-        progress_container.empty()
+        clean_jd = normalize_text(jd_input, preserve_structure=True)
+        load_embedding_model()
+        profile = load_job_profile(job_profile_key(clean_jd), clean_jd)
+        documents = [(file.name, file.getvalue()) for file in uploaded_files]
         
-        st.session_state.results = results
-        st.session_state.analysis_complete = True
-        st.success(f"✅ **Analysis Complete!** Successfully processed **{len(results)}** resume(s)")
+        # Parse, extract and score in the background; results arrive as they finish
+        # (files parsed before are served from the content-hash document cache)
+        job = start_job(profile, documents, ANALYSIS_BATCH_SIZE, collect_timings)
+        st.session_state.job_id = job.id
+        st.session_state.job_collected = 0
+        st.session_state.job_warnings = []
+        st.session_state.results = []
+        st.session_state.feature_table = None
+        st.session_state.analysis_complete = False
+        st.session_state.timings = None
+
+# BACKGROUND JOB
+if st.session_state.job_id:
+    sync_job()
+job_progress()
+
+for warning in st.session_state.job_warnings:
+    st.warning(f"⚠️ {warning}")
+
+if st.session_state.job_finished:
+    if st.session_state.job_finished == 'done':
+        st.success(f"✅ **Analysis Complete!** Successfully processed **{len(st.session_state.results)}** resume(s)")
         st.balloons()
+    else:
+        st.info(f"⏹️ Analysis {st.session_state.job_finished}; showing "
+                f"**{len(st.session_state.results)}** resume(s) scored before it stopped")
+    st.session_state.job_finished = None
 
 # ==================== RESULTS DISPLAY ====================
-if st.session_state.analysis_complete and st.session_state.results:
+if st.session_state.results:
     results = st.session_state.results
-    df = pd.DataFrame(results).sort_values('overall_score', ascending=False).reset_index(drop=True)
+    df = pd.DataFrame(results)
+    # Re-weighting only recombines the stored component scores
+    if st.session_state.feature_table is not None:
+        df['overall_score'] = st.session_state.feature_table.scores(scoring_weights)
+        # The detail view and JSON export carry the same score (breakdown values are unweighted components)
+        df['full_analysis'] = [
+            {**analysis, 'overall_score': score, 'scoring_weights': dict(scoring_weights)}
+            for analysis, score in zip(df['full_analysis'], df['overall_score'].tolist())
+        ]
+    df = df.sort_values('overall_score', ascending=False).reset_index(drop=True)
     
     # ===== SUMMARY DASHBOARD =====
     st.markdown('<div class="section-header">📊 Analysis Dashboard</div>', unsafe_allow_html=True)
@@ -668,6 +752,34 @@ if st.session_state.analysis_complete and st.session_state.results:
                 """
                 st.markdown(score_breakdown_html, unsafe_allow_html=True)
     
+    # ===== PERFORMANCE PANEL =====
+    if st.session_state.timings:
+        timings = st.session_state.timings
+        with st.expander("⏱️ Performance Details", expanded=False):
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Wall Time", f"{timings['wall_seconds']:.2f} s")
+            col2.metric("Throughput", f"{timings['documents'] / max(timings['wall_seconds'], 1e-9):.1f} resumes/s")
+            col3.metric("Stage Time (all workers)", f"{timings['total_ms'] / 1000:.2f} s")
+            
+            stage_rows = [
+                {
+                    'Stage': name,
+                    'Calls': stats['calls'],
+                    'Total (ms)': round(stats['ms'], 1),
+                    'Avg (ms)': round(stats['ms'] / max(stats['calls'], 1), 2),
+                    'Share (%)': round(stats['ms'] / max(timings['total_ms'], 1e-9) * 100, 1) if '/' not in name else None,
+                    'Text (KB)': round(stats['chars'] / 1024, 1),
+                }
+                for name, stats in timings['stages'].items()
+            ]
+            st.dataframe(
+                pd.DataFrame(stage_rows).sort_values('Total (ms)', ascending=False),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.caption("Stages run in parallel worker processes, so stage time can exceed wall time. "
+                       "Nested stages (a/b) are included in their parent.")
+    
     # ===== EXPORT SECTION =====
     st.markdown('<div class="section-header">📥 Export Results</div>', unsafe_allow_html=True)
     
@@ -727,7 +839,7 @@ TOP 5 CANDIDATES
         )
 
 # ==================== WELCOME SCREEN ====================
-else:
+elif not st.session_state.job_id:
     st.markdown("""
     <div class="welcome-card">
         <h2 style="color: white; margin-bottom: 1rem;">👋 Welcome to ProMatch</h2>
@@ -882,8 +994,12 @@ else:
         **Yes!** All data is processed locally:
         
         - No data is sent to external servers
-        - Files are processed in memory only
-        - No permanent storage of uploaded documents
+        - Uploaded files are read in memory and never saved as files
+        - To speed up re-runs, text embeddings and parsed resumes (extracted
+          text, emails and phone numbers) are cached on this machine under
+          `PROMATCH_CACHE_DIR` (default `~/.cache/promatch`)
+        - Set `PROMATCH_PARSED_CACHE_MB=0` to keep resume text and contact
+          details off disk (`PROMATCH_EMBEDDING_CACHE_MB=0` for embeddings)
         - Session data is cleared on reset
         - Export files are generated client-side
         """)
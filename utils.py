@@ -2,10 +2,91 @@
 IMPROVED UTILITIES
 Better email, phone, education, and experience extraction
 """
-from pdfminer.high_level import extract_text as pdf_extract_text
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
+from pdfminer.pdfpage import PDFPage
 import docx
+import io
 import re
-from config import SKILL_SYNONYMS, STOP_WORDS
+import signal
+import threading
+from contextlib import contextmanager
+from config import STOP_WORDS, PDF_MAX_PAGES, PDF_MAX_CHARS
+from skill_patterns import get_synonym_patterns
+from sections import segment_sections
+
+# Layout analysis for resumes: plain reading order instead of pdfminer's
+# hierarchical box ordering (boxes_flow), no vertical text detection, and
+# no analysis of text inside figures
+PDF_LAPARAMS = LAParams(line_margin=0.5, char_margin=2.0, word_margin=0.1,
+                        boxes_flow=None, detect_vertical=False, all_texts=False)
+
+
+class ParseTimeout(BaseException):
+    """
+    A file took longer than its parse time limit
+    A BaseException (like KeyboardInterrupt) so the broad `except Exception`
+    handlers in the parsers and pdfminer cannot swallow it mid-parse
+    """
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raise ParseTimeout in the block after `seconds` of wall-clock time
+    Uses SIGALRM, so it only applies in the main thread on POSIX (pipeline
+    worker processes, the CLI); elsewhere the block runs unlimited
+    """
+    if (not seconds or seconds <= 0 or not hasattr(signal, 'SIGALRM')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+    
+    def on_alarm(signum, frame):
+        raise ParseTimeout(f"parsing took longer than {seconds:g}s")
+    
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def iter_pdf_pages(pdf_file, max_pages=PDF_MAX_PAGES):
+    """
+    Yield the text of each PDF page as it is parsed
+    pdf_file: path or binary file object; stops after max_pages (0 = all)
+    """
+    if isinstance(pdf_file, str):
+        with open(pdf_file, 'rb') as f:
+            yield from iter_pdf_pages(f, max_pages)
+        return
+    
+    manager = PDFResourceManager(caching=True)
+    for page in PDFPage.get_pages(pdf_file, maxpages=max_pages, caching=True):
+        output = io.StringIO()
+        device = TextConverter(manager, output, laparams=PDF_LAPARAMS)
+        try:
+            PDFPageInterpreter(manager, device).process_page(page)
+        finally:
+            device.close()
+        yield output.getvalue()
+
+
+def extract_pdf_text(pdf_file, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS):
+    """Text of a PDF, read page by page until the page or character budget runs out"""
+    parts = []
+    total = 0
+    for text in iter_pdf_pages(pdf_file, max_pages):
+        parts.append(text)
+        total += len(text)
+        if max_chars and total >= max_chars:
+            break
+    text = ''.join(parts)
+    return text[:max_chars] if max_chars else text
 
 def extract_emails(text):
     """
@@ -79,13 +160,8 @@ def normalize_text(text, preserve_structure=False):
     
     text = text.lower()
     
-    # Apply skill synonyms (sorted by length for proper replacement)
-    sorted_skills = sorted(SKILL_SYNONYMS.items(), key=lambda x: len(x[0]), reverse=True)
-    
-    for abbr, full in sorted_skills:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(abbr) + r'\b'
-        text = re.sub(pattern, full, text, flags=re.IGNORECASE)
+    # Apply skill synonyms (longest alias first)
+    text, _ = get_synonym_patterns().canonicalize(text, track_spans=False)
     
     # Remove URLs
     text = re.sub(r'http\S+|www\.\S+', '', text)
@@ -106,17 +182,38 @@ def normalize_text(text, preserve_structure=False):
     return text.strip()
 
 
-def extract_text_from_file(uploaded_file):
+def canonicalize_skills(text):
+    """
+    Lowercase text and replace skill aliases with canonical names
+    Returns (text, spans); spans map each replacement back to its
+    (start, end) in the lowercased input, see skill_patterns.map_to_source
+    """
+    if not text:
+        return "", []
+    return get_synonym_patterns().canonicalize(text.lower())
+
+
+def extract_text_from_file(uploaded_file, timeout=None):
     """
     Extract text from uploaded file (PDF, DOCX, TXT)
+    timeout: wall-clock seconds allowed (see time_limit)
     Returns (text, error_message)
     """
+    try:
+        with time_limit(timeout):
+            return _extract_text(uploaded_file)
+    except ParseTimeout as e:
+        return "", f"Error processing file: {e}"
+
+
+def _extract_text(uploaded_file):
+    """extract_text_from_file without the time limit"""
     try:
         file_name = uploaded_file.name if hasattr(uploaded_file, 'name') else str(uploaded_file)
         file_extension = file_name.split('.')[-1].lower()
         
         if file_extension == 'pdf':
-            text = pdf_extract_text(uploaded_file)
+            text = extract_pdf_text(uploaded_file)
             
         elif file_extension in ['docx', 'doc']:
             doc = docx.Document(uploaded_file)
@@ -191,28 +288,19 @@ def extract_years_of_experience(resume_text):
     return max(years) if years else None
 
 
-def extract_education_level(resume_text):
+def extract_education_level(resume_text, sections=None):
     """
     STRICT education level detection
     Only returns if EXPLICITLY mentioned
     NO false positives
+    sections: SectionIndex of resume_text, when already segmented
     """
     text_lower = resume_text.lower()
+    if sections is None:
+        sections = segment_sections(resume_text)
     
-    # Try to isolate education section first
-    education_section = ""
-    
-    edu_section_patterns = [
-        r'education\s*:?(.*?)(?:experience|skills|projects|certifications|achievements|$)',
-        r'academic\s+(?:background|qualifications)\s*:?(.*?)(?:experience|skills|$)',
-        r'qualifications\s*:?(.*?)(?:experience|skills|$)',
-    ]
-    
-    for pattern in edu_section_patterns:
-        match = re.search(pattern, text_lower, re.DOTALL | re.IGNORECASE)
-        if match:
-            education_section = match.group(1)
-            break
+    # Education section from its header line to the next section header
+    education_section = sections.text(resume_text, 'education', with_header=True).lower()
     
     # If no section found, use full text but with STRICT matching
     search_text = education_section if education_section else text_lower
@@ -252,54 +340,30 @@ def extract_education_level(resume_text):
     return None
 
 
-def calculate_resume_completeness(resume_text):
+def calculate_resume_completeness(resume_text, sections=None):
     """
     Score resume completeness based on key sections
     Returns dict with score and details
+    sections: SectionIndex of resume_text, when already segmented
     """
     score = 0
     sections_found = []
     
-    # Define sections and their point values
+    # Define sections and their point values (keywords: sections.SECTION_KEYWORDS)
     section_checks = {
-        'contact': {
-            'patterns': [r'@', r'\+?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}', r'linkedin', r'github'],
-            'points': 15,
-            'name': 'Contact Information'
-        },
-        'experience': {
-            'patterns': [r'experience|employment|work history|professional background'],
-            'points': 30,
-            'name': 'Work Experience'
-        },
-        'education': {
-            'patterns': [r'education|degree|university|college|academic'],
-            'points': 20,
-            'name': 'Education'
-        },
-        'skills': {
-            'patterns': [r'skills|technologies|competencies|technical skills|expertise'],
-            'points': 25,
-            'name': 'Skills'
-        },
-        'summary': {
-            'patterns': [r'summary|objective|about|profile|professional summary'],
-            'points': 10,
-            'name': 'Summary/Objective'
-        }
+        'contact': {'points': 15, 'name': 'Contact Information'},
+        'experience': {'points': 30, 'name': 'Work Experience'},
+        'education': {'points': 20, 'name': 'Education'},
+        'skills': {'points': 25, 'name': 'Skills'},
+        'summary': {'points': 10, 'name': 'Summary/Objective'},
     }
     
-    text_lower = resume_text.lower()
+    if sections is None:
+        sections = segment_sections(resume_text)
     
     # Check each section
     for section_key, section_data in section_checks.items():
-        found = False
-        for pattern in section_data['patterns']:
-            if re.search(pattern, text_lower):
-                found = True
-                break
-        
-        if found:
+        if section_key in sections.keywords:
             score += section_data['points']
             sections_found.append(section_data['name'])
     
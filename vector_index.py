@@ -0,0 +1,197 @@
+"""
+Vector Index
+Inverted-file (IVF) nearest-neighbour search over unit embeddings, pure NumPy
+
+Vectors are clustered by spherical k-means; each cluster's vectors are
+stored contiguously. A query scores the centroids, then only the vectors
+of the `nprobe` closest clusters, so search cost grows with
+nprobe / lists of the collection instead of all of it.
+
+Files (prefix 'ivf'), written by IVFIndex.build():
+- ivf.centroids: float32 (lists, dim)
+- ivf.offsets:   int64 (lists + 1) start of each cluster in rows/vectors
+- ivf.rows:      int64 (count) original row of each stored vector
+- ivf.vectors:   float32 (count, dim) vectors grouped by cluster
+- ivf.json:      count, lists and dim
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Vectors per k-means training run (sampled when the collection is larger)
+MAX_TRAINING_VECTORS = 100000
+
+# Vectors assigned / scored per matrix product
+ASSIGN_CHUNK = 65536
+
+
+def default_lists(count):
+    """Cluster count for a collection: about 4 * sqrt(count)"""
+    return max(1, min(count, int(4 * np.sqrt(count))))
+
+
+def default_nprobe(lists):
+    """Clusters scanned per query (recall/latency trade-off, see bench_ann.py)"""
+    return max(1, int(np.ceil(lists / 16)))
+
+
+def _top(scores, k):
+    """Indices of the k highest scores, best first (lower index among ties)"""
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def _assign(vectors, centroids):
+    """Closest centroid (highest dot product) of every vector"""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        block = np.asarray(vectors[start:start + ASSIGN_CHUNK], dtype=np.float32)
+        labels[start:start + len(block)] = (block @ centroids.T).argmax(axis=1)
+    return labels
+
+
+def train_centroids(vectors, lists, iterations=10, seed=0):
+    """Spherical k-means centroids (unit rows) of a sample of the vectors"""
+    rng = np.random.default_rng(seed)
+    count = len(vectors)
+    sample = np.sort(rng.choice(count, min(count, MAX_TRAINING_VECTORS), replace=False))
+    data = np.asarray(vectors[sample], dtype=np.float32)
+
+    centroids = data[rng.choice(len(data), lists, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(data, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+        norms = np.linalg.norm(sums, axis=1)
+        # Empty clusters restart from a random training vector
+        empty = norms == 0
+        if empty.any():
+            sums[empty] = data[rng.choice(len(data), int(empty.sum()), replace=False)]
+            norms[empty] = np.linalg.norm(sums[empty], axis=1)
+        centroids = sums / np.maximum(norms, 1e-12)[:, None]
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """
+    Clustered vectors for approximate top-k dot-product search
+    rows: original row id of each vector (search returns these)
+    """
+
+    def __init__(self, centroids, offsets, rows, vectors):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+        self.vectors = vectors
+
+    @classmethod
+    def build(cls, directory, vectors, rows=None, lists=None, iterations=10, seed=0, prefix='ivf'):
+        """
+        Train an index, write it to directory and return it (memory-mapped)
+        vectors: unit rows; anything with len() and NumPy indexing (memmaps
+        included), read in chunks so the collection never has to fit in memory
+        """
+        count = len(vectors)
+        if not count:
+            raise ValueError("cannot index an empty collection")
+        rows = np.arange(count, dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64)
+        lists = default_lists(count) if lists is None else max(1, min(int(lists), count, MAX_TRAINING_VECTORS))
+
+        centroids = train_centroids(vectors, lists, iterations, seed)
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind='stable')
+        offsets = np.searchsorted(labels[order], np.arange(lists + 1)).astype(np.int64)
+
+        path = os.path.join(directory, prefix)
+        drop_index(directory, prefix)
+        grouped = np.memmap(f"{path}.vectors", dtype='<f4', mode='w+', shape=(count, centroids.shape[1]))
+        for start in range(0, count, ASSIGN_CHUNK):
+            grouped[start:start + ASSIGN_CHUNK] = vectors[order[start:start + ASSIGN_CHUNK]]
+        grouped.flush()
+        del grouped
+        centroids.astype('<f4').tofile(f"{path}.centroids")
+        offsets.astype('<i8').tofile(f"{path}.offsets")
+        rows[order].astype('<i8').tofile(f"{path}.rows")
+
+        # Written last: a partially written index is never loaded
+        meta = {'count': count, 'lists': lists, 'dim': int(centroids.shape[1])}
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp, f"{path}.json")
+        return cls.load(directory, prefix)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def lists(self):
+        return len(self.centroids)
+
+    def search(self, query, k, nprobe=None):
+        """
+        (rows, scores) of the approximate k best vectors for a query, best first
+        nprobe: clusters scanned (default_nprobe; lists = exact search)
+        """
+        if not len(self) or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = default_nprobe(self.lists) if nprobe is None else max(1, min(int(nprobe), self.lists))
+
+        probed = _top(self.centroids @ query, nprobe)
+        found_rows = []
+        found_scores = []
+        for cluster in probed.tolist():
+            start, stop = self.offsets[cluster], self.offsets[cluster + 1]
+            if stop > start:
+                found_scores.append(np.asarray(self.vectors[start:stop]) @ query)
+                found_rows.append(np.asarray(self.rows[start:stop]))
+        if not found_rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        rows = np.concatenate(found_rows)
+        scores = np.concatenate(found_scores)
+        # Order by score, then by row id, so results do not depend on cluster order
+        best = np.lexsort((rows, -scores))[:k]
+        return rows[best], scores[best]
+
+    @classmethod
+    def load(cls, directory, prefix='ivf'):
+        """Memory-mapped index, or None when none was saved"""
+        path = os.path.join(directory, prefix)
+        try:
+            with open(f"{path}.json") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        count, lists, dim = meta['count'], meta['lists'], meta['dim']
+        centroids = np.fromfile(f"{path}.centroids", dtype='<f4').reshape(lists, dim)
+        offsets = np.fromfile(f"{path}.offsets", dtype='<i8')
+        rows = np.memmap(f"{path}.rows", dtype='<i8', mode='r', shape=(count,))
+        vectors = np.memmap(f"{path}.vectors", dtype='<f4', mode='r', shape=(count, dim))
+        return cls(centroids, offsets, rows, vectors)
+
+
+def drop_index(directory, prefix='ivf'):
+    """Forget a saved index (its data files are overwritten by the next build)"""
+    try:
+        os.remove(os.path.join(directory, f"{prefix}.json"))
+    except FileNotFoundError:
+        pass
+
+
+def exact_search(vectors, query, k, rows=None):
+    """Brute-force (rows, scores) of the k best vectors, best first"""
+    query = np.asarray(query, dtype=np.float32)
+    scores = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        scores[start:start + ASSIGN_CHUNK] = np.asarray(vectors[start:start + ASSIGN_CHUNK]) @ query
+    best = _top(scores, k)
+    row_ids = best if rows is None else np.asarray(rows)[best]
+    return row_ids.astype(np.int64), scores[best]
@@ -0,0 +1,69 @@
+"""
+Skill Vocabulary
+Dense integer IDs for every canonical skill
+
+Skill sets become boolean rows over the vocabulary (one column per
+skill), so a batch of candidates is an (n_candidates, n_skills) matrix
+and matching is array indexing instead of string-set operations.
+"""
+import numpy as np
+from config import SKILL_SYNONYMS
+
+
+class SkillVocabulary:
+    """
+    Canonical skill <-> integer ID
+    sources: iterables of skill names, or {skill: [skills]} tables whose
+    keys and values are all added; IDs follow first appearance
+    """
+
+    def __init__(self, *sources):
+        self.names = []
+        self.ids = {}
+        for source in sources:
+            if isinstance(source, dict):
+                for skill, targets in source.items():
+                    self._add(skill)
+                    for target in targets:
+                        self._add(target)
+            else:
+                for skill in source:
+                    self._add(skill)
+
+    def _add(self, name):
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def id_array(self, skills):
+        """IDs of skills in order; -1 for skills outside the vocabulary"""
+        return np.array([self.ids.get(s, -1) for s in skills], dtype=np.int64)
+
+    def mask(self, skills):
+        """Boolean row with the known skills set"""
+        row = np.zeros(len(self.names), dtype=bool)
+        row[[self.ids[s] for s in skills if s in self.ids]] = True
+        return row
+
+    def matrix(self, skill_sets):
+        """(len(skill_sets), vocabulary size) boolean matrix"""
+        skill_sets = list(skill_sets)
+        matrix = np.zeros((len(skill_sets), len(self.names)), dtype=bool)
+        for row, skills in enumerate(skill_sets):
+            matrix[row, [self.ids[s] for s in skills if s in self.ids]] = True
+        return matrix
+
+    def skills(self, row):
+        """Skill names set in a boolean row"""
+        return {self.names[i] for i in np.flatnonzero(row)}
+
+
+def canonical_skills():
+    """Canonical skills of SKILL_SYNONYMS in first-appearance order"""
+    return list(dict.fromkeys(SKILL_SYNONYMS.values()))